@@ -0,0 +1,187 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.cache import atomic_write_text, cache_dir
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+SYSTEM_INSTRUCTION = (
+    "You are a code generation bot. Only output working Python Manim code, "
+    "no explanations or extra text. Generate complete, functional, properly formatted Python code."
+)
+URL_ENV = "MAGICALMANIM_AI_URL"
+
+class Cancelled(Exception):
+    pass
+
+def strip_fences(text):
+    code = re.sub(r'^```[\w]*\s*', '', text)
+    return re.sub(r'\s*```$', '', code).strip()
+
+class GeminiBackend:
+    name = "gemini"
+
+    def __init__(self, api_key):
+        from google import genai
+
+        self.client = genai.Client(api_key=api_key)
+
+    def stream(self, prompt, model, system):
+        from google.genai import types
+
+        chunks = self.client.models.generate_content_stream(
+            model=model,
+            config=types.GenerateContentConfig(system_instruction=system),
+            contents=prompt,
+        )
+        try:
+            for chunk in chunks:
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+class HTTPBackend:
+    name = "http"
+
+    def __init__(self, url, timeout=60):
+        self.url = url
+        self.timeout = timeout
+
+    def stream(self, prompt, model, system):
+        body = json.dumps({"prompt": prompt, "model": model, "system": system}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                text = json.loads(line).get("text", "")
+                if text:
+                    yield text
+
+def default_backend():
+    url = os.getenv(URL_ENV)
+    if url:
+        return HTTPBackend(url)
+    api_key = os.getenv("GEMINI_API_KEY")
+    return GeminiBackend(api_key) if api_key else None
+
+class ResponseCache:
+    def __init__(self, path=None, max_entries=500, max_bytes=32 * 1024 * 1024):
+        self.dir = path or cache_dir("ai")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(self, prompt, model, system):
+        payload = json.dumps([model, system, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        path = self.dir / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        # mtime doubles as the LRU clock
+        os.utime(path)
+        return entry["text"]
+
+    def put(self, key, text, **meta):
+        atomic_write_text(self.dir / f"{key}.json", json.dumps(dict(meta, text=text, time=time.time())))
+        self.prune()
+
+    def prune(self):
+        entries = []
+        for path in self.dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort(reverse=True)
+        total = 0
+        for count, (_, size, path) in enumerate(entries, 1):
+            total += size
+            if count > self.max_entries or total > self.max_bytes:
+                path.unlink(missing_ok=True)
+
+def generate(prompt, backend, cache=None, on_chunk=None, cancelled=None,
+             model=DEFAULT_MODEL, system=SYSTEM_INSTRUCTION):
+    key = cache.key(prompt, model, system) if cache else None
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        if on_chunk:
+            on_chunk(cached)
+        return cached, True
+    parts = []
+    stream = backend.stream(prompt, model, system)
+    try:
+        for text in stream:
+            if cancelled and cancelled():
+                raise Cancelled()
+            parts.append(text)
+            if on_chunk:
+                on_chunk(text)
+    finally:
+        stream.close()
+    text = "".join(parts)
+    if cache and text.strip():
+        cache.put(key, text, prompt=prompt, model=model, backend=backend.name)
+    return text, False
+
+STUB_SCENE = '''```python
+from manim import *
+
+class Output(Scene):
+    def construct(self):
+        circle = Circle(color=BLUE)
+        square = Square(color=GREEN)
+        self.play(Create(circle))
+        self.play(Transform(circle, square))
+        self.wait()
+```'''
+
+class _StubHandler(BaseHTTPRequestHandler):
+    delay = 0.02
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        self.log_message("prompt %r for %s", request.get("prompt"), request.get("model"))
+        try:
+            for i in range(0, len(STUB_SCENE), 24):
+                self.wfile.write((json.dumps({"text": STUB_SCENE[i:i + 24]}) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(self.delay)
+        except (BrokenPipeError, ConnectionResetError):
+            # the editor hung up because the request was cancelled
+            pass
+
+def serve_stub(port=8765):
+    server = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+    print(f"Stub AI backend on http://127.0.0.1:{port}/ (set {URL_ENV} to use it)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.ai", description="Offline stand-in for the AI code backend.")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    serve_stub(args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import wave
+from pathlib import Path
+
+from core.cache import cache_dir
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+# finest peak level is one min/max pair per BASE_BUCKET samples; each coarser level groups FACTOR buckets
+BASE_BUCKET = 256
+FACTOR = 4
+MIN_BUCKETS = 64
+
+_hashes = {}
+
+def content_key(path):
+    path = Path(path)
+    st = path.stat()
+    stamp = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    key = _hashes.get(stamp)
+    if key is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        key = _hashes[stamp] = digest.hexdigest()[:32]
+    return key
+
+def decode_pcm(path):
+    # yields interleaved int16 stereo chunks at SAMPLE_RATE, whatever the source format
+    import av
+
+    with av.open(str(path)) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="s16", layout="stereo", rate=SAMPLE_RATE)
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                yield out.to_ndarray().reshape(-1, CHANNELS)
+        for out in resampler.resample(None):
+            yield out.to_ndarray().reshape(-1, CHANNELS)
+
+class PeakBuilder:
+    def __init__(self):
+        import numpy as np
+
+        self.np = np
+        self.rest = np.zeros(0, dtype=np.int16)
+        self.blocks = []
+
+    def feed(self, chunk):
+        np = self.np
+        mono = (chunk.astype(np.int32).sum(axis=1) // CHANNELS).astype(np.int16)
+        samples = np.concatenate([self.rest, mono])
+        whole = len(samples) // BASE_BUCKET * BASE_BUCKET
+        if whole:
+            buckets = samples[:whole].reshape(-1, BASE_BUCKET)
+            self.blocks.append(np.stack([buckets.min(axis=1), buckets.max(axis=1)], axis=1))
+        self.rest = samples[whole:]
+
+    def levels(self):
+        np = self.np
+        blocks = list(self.blocks)
+        if len(self.rest):
+            blocks.append(np.array([[self.rest.min(), self.rest.max()]], dtype=np.int16))
+        level = np.concatenate(blocks) if blocks else np.zeros((1, 2), dtype=np.int16)
+        levels = [level]
+        while len(level) > MIN_BUCKETS:
+            pad = -len(level) % FACTOR
+            if pad:
+                level = np.concatenate([level, np.repeat(level[-1:], pad, axis=0)])
+            grouped = level.reshape(-1, FACTOR, 2)
+            level = np.stack([grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], axis=1)
+            levels.append(level)
+        return levels
+
+class PeakIndex:
+    def __init__(self, levels, rate=SAMPLE_RATE, base=BASE_BUCKET, factor=FACTOR):
+        self.levels = levels
+        self.rate = rate
+        self.base = base
+        self.factor = factor
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            levels = [data[f"level{i}"] for i in range(meta["levels"])]
+        return cls(levels, meta["rate"], meta["base"], meta["factor"])
+
+    def save(self, path):
+        import numpy as np
+
+        meta = {"rate": self.rate, "base": self.base, "factor": self.factor, "levels": len(self.levels)}
+        arrays = {f"level{i}": level for i, level in enumerate(self.levels)}
+        path = Path(path)
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, meta=json.dumps(meta), **arrays)
+        os.replace(tmp, path)
+
+    @property
+    def duration(self):
+        return len(self.levels[0]) * self.base / self.rate
+
+    def peaks(self, start, end, width):
+        # (width, 2) min/max in -1..1 for the span, read from the coarsest level that still has a bucket per pixel
+        import numpy as np
+
+        out = np.zeros((max(width, 0), 2))
+        if width <= 0 or end <= start:
+            return out
+        samples_per_px = (end - start) * self.rate / width
+        level, bucket = 0, self.base
+        while level + 1 < len(self.levels) and bucket * self.factor <= samples_per_px:
+            level += 1
+            bucket *= self.factor
+        data = self.levels[level]
+        n = len(data)
+        edges = ((start * self.rate + np.arange(width + 1) * samples_per_px) // bucket).astype(np.int64)
+        lo = np.clip(edges[:-1], 0, n)
+        hi = np.maximum(np.clip(edges[1:], 0, n), lo + 1)
+        valid = lo < n
+        if not valid.any():
+            return out
+        # the pad row lets a span end exactly at n; reduceat over (lo, hi) pairs keeps the even results
+        padded = np.concatenate([data, data[-1:]])
+        bounds = np.stack([lo[valid], np.minimum(hi[valid], n)], axis=1).ravel()
+        out[valid, 0] = np.minimum.reduceat(padded[:, 0], bounds)[::2] / 32768
+        out[valid, 1] = np.maximum.reduceat(padded[:, 1], bounds)[::2] / 32768
+        return out
+
+class AudioCache:
+    def __init__(self, root=None, max_bytes=2 * 1024 ** 3):
+        self.root = Path(root) if root else cache_dir("audio")
+        self.max_bytes = max_bytes
+
+    def wav_path(self, key):
+        return self.root / f"{key}.wav"
+
+    def peaks_path(self, key):
+        return self.root / f"{key}.peaks.npz"
+
+    def prepare(self, path):
+        # transcode once per distinct file content; later calls are a hash lookup
+        key = content_key(path)
+        wav_path, peaks_path = self.wav_path(key), self.peaks_path(key)
+        if wav_path.exists() and peaks_path.exists():
+            os.utime(wav_path)
+            return key
+        builder = PeakBuilder()
+        tmp = wav_path.with_name(f".{wav_path.name}.{os.getpid()}.tmp")
+        with wave.open(str(tmp), "wb") as out:
+            out.setnchannels(CHANNELS)
+            out.setsampwidth(2)
+            out.setframerate(SAMPLE_RATE)
+            for chunk in decode_pcm(path):
+                out.writeframes(chunk.astype("<i2").tobytes())
+                builder.feed(chunk)
+        os.replace(tmp, wav_path)
+        PeakIndex(builder.levels()).save(peaks_path)
+        self.prune()
+        return key
+
+    def render_ready(self, path, length=None):
+        key = self.prepare(path)
+        if length is None:
+            return self.wav_path(key)
+        return self.trimmed(key, length)
+
+    def trimmed(self, key, length):
+        source = self.wav_path(key)
+        ms = max(1, int(round(length * 1000)))
+        target = self.root / f"{key}.{ms}ms.wav"
+        if target.exists():
+            os.utime(target)
+            return target
+        frames = ms * SAMPLE_RATE // 1000
+        with wave.open(str(source), "rb") as src:
+            if frames >= src.getnframes():
+                return source
+            data = src.readframes(frames)
+            params = src.getparams()
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        with wave.open(str(tmp), "wb") as out:
+            out.setparams(params)
+            out.writeframes(data)
+        os.replace(tmp, target)
+        return target
+
+    def peak_index(self, path):
+        return PeakIndex.load(self.peaks_path(self.prepare(path)))
+
+    def prune(self):
+        files = []
+        total = 0
+        for path in self.root.glob("*"):
+            if path.name.startswith("."):
+                continue
+            st = path.stat()
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                continue
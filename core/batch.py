@@ -0,0 +1,184 @@
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from core.cache import atomic_write_text
+from core.catalog import load_catalog
+from core.codegen import generate_script
+from core.render_daemon import RenderDaemon
+
+SETTINGS_KEYS = ("quality", "fps", "resolution", "workers", "chunk_size", "scene")
+
+class BatchJob:
+    def __init__(self, spec, base_dir, defaults, index):
+        self.spec = dict(defaults, **spec)
+        self.base_dir = base_dir
+        self.id = str(spec.get("id") or f"job{index:04d}")
+        self.source = None
+        self.digest = None
+        self.config = None
+
+    def resolve(self, path):
+        path = Path(path)
+        return path if path.is_absolute() else self.base_dir / path
+
+    def load_source(self, catalog):
+        if "script" in self.spec:
+            return self.resolve(self.spec["script"]).read_text(encoding="utf-8")
+        props = json.loads(self.resolve(self.spec["props"]).read_text(encoding="utf-8"))
+        sound = self.spec.get("sound")
+        return generate_script(props, catalog, str(self.resolve(sound)) if sound else None)
+
+    def render_config(self, output_dir):
+        config = {"quality": self.spec.get("quality", "low_quality")}
+        if "fps" in self.spec:
+            config["frame_rate"] = self.spec["fps"]
+        if "resolution" in self.spec:
+            config["pixel_width"], config["pixel_height"] = self.spec["resolution"]
+        config["media_dir"] = str(output_dir / self.id)
+        return config
+
+    def prepare(self, catalog, output_dir):
+        self.source = self.load_source(catalog)
+        settings = {k: self.spec.get(k) for k in SETTINGS_KEYS}
+        payload = json.dumps([self.source, settings], sort_keys=True, default=str)
+        self.digest = hashlib.sha256(payload.encode()).hexdigest()
+        self.config = self.render_config(output_dir)
+
+def load_state(path):
+    done = {}
+    if not path.exists():
+        return done
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # a crash can leave a torn last line
+            continue
+        if record.get("status") == "ok":
+            done[record["id"]] = record
+    return done
+
+class BatchRunner:
+    def __init__(self, manifest_path, concurrency=None, state_path=None, summary_path=None, resume=True, log=print):
+        self.manifest_path = Path(manifest_path).resolve()
+        self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        base = self.manifest_path.parent
+        self.output_dir = (base / self.manifest.get("output_dir", "renders")).resolve()
+        self.work_dir = self.output_dir / ".work"
+        self.concurrency = max(1, int(concurrency or self.manifest.get("concurrency", 1)))
+        self.state_path = Path(state_path) if state_path else self.manifest_path.with_suffix(".state.jsonl")
+        self.summary_path = Path(summary_path) if summary_path else self.manifest_path.with_suffix(".summary.json")
+        self.resume = resume
+        self.log = log
+        defaults = self.manifest.get("defaults", {})
+        self.jobs = [BatchJob(spec, base, defaults, i) for i, spec in enumerate(self.manifest.get("jobs", []))]
+        self._state_lock = threading.Lock()
+        self._local = threading.local()
+        self._daemons = []
+
+    def daemon(self):
+        daemon = getattr(self._local, "daemon", None)
+        if daemon is None:
+            daemon = self._local.daemon = RenderDaemon()
+            self._daemons.append(daemon)
+        return daemon
+
+    def record(self, result):
+        with self._state_lock:
+            with self.state_path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(result) + "\n")
+
+    def run_job(self, job):
+        started = time.perf_counter()
+        result = {"id": job.id, "digest": job.digest, "status": "failed", "output": None, "error": None}
+        payload = {
+            "source": job.source,
+            "workdir": str(self.work_dir / job.id),
+            "module": "batch_scene",
+            "scene": job.spec.get("scene"),
+            "config": job.config,
+            "workers": job.spec.get("workers", 1),
+            "chunk_size": job.spec.get("chunk_size", 1),
+        }
+        cache = None
+        for event in self.daemon().submit(payload):
+            if event["event"] == "done":
+                result.update(status="ok", output=event["output"])
+            elif event["event"] == "error":
+                result["error"] = event["text"]
+            elif event["event"] == "cache":
+                cache = {"hits": event["hits"], "total": event["total"]}
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        result["segment_cache"] = cache
+        self.record(result)
+        self.log(f"[{result['status']}] {job.id} in {result['seconds']}s {result['output'] or ''}".rstrip())
+        return result
+
+    def run(self):
+        started = time.time()
+        catalog = load_catalog()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        done = load_state(self.state_path) if self.resume else {}
+        results = []
+        pending = []
+        for job in self.jobs:
+            try:
+                job.prepare(catalog, self.output_dir)
+            except Exception as e:
+                results.append({"id": job.id, "status": "failed", "output": None, "error": f"{e}", "seconds": 0})
+                continue
+            previous = done.get(job.id)
+            if previous and previous.get("digest") == job.digest and previous.get("output") and Path(previous["output"]).exists():
+                results.append(dict(previous, status="skipped"))
+                continue
+            pending.append(job)
+        self.log(f"{len(pending)} jobs to render, {len(self.jobs) - len(pending)} skipped or invalid")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = [pool.submit(self.run_job, job) for job in pending]
+                for future in as_completed(futures):
+                    results.append(future.result())
+        finally:
+            for daemon in self._daemons:
+                daemon.stop()
+
+        order = {job.id: i for i, job in enumerate(self.jobs)}
+        results.sort(key=lambda r: order.get(r["id"], len(order)))
+        summary = {
+            "manifest": str(self.manifest_path),
+            "started": started,
+            "seconds": round(time.time() - started, 3),
+            "ok": sum(r["status"] == "ok" for r in results),
+            "skipped": sum(r["status"] == "skipped" for r in results),
+            "failed": sum(r["status"] == "failed" for r in results),
+            "jobs": results,
+        }
+        atomic_write_text(self.summary_path, json.dumps(summary, indent=4))
+        return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.batch", description="Render Magical Manim projects without the GUI")
+    parser.add_argument("manifest", help="JSON manifest listing the jobs to render")
+    parser.add_argument("-j", "--concurrency", type=int, help="override the manifest's concurrency limit")
+    parser.add_argument("--state", help="resume journal (default: <manifest>.state.jsonl)")
+    parser.add_argument("--summary", help="summary output (default: <manifest>.summary.json)")
+    parser.add_argument("--no-resume", action="store_true", help="render every job even if it finished before")
+    args = parser.parse_args(argv)
+    runner = BatchRunner(
+        args.manifest, concurrency=args.concurrency, state_path=args.state,
+        summary_path=args.summary, resume=not args.no_resume,
+        log=lambda msg: print(msg, file=sys.stderr, flush=True),
+    )
+    summary = runner.run()
+    print(json.dumps(summary, indent=4))
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+import os
+from pathlib import Path
+
+CACHE_DIR = Path(os.getenv("MAGICALMANIM_CACHE", Path.home() / ".cache" / "magicalmanim"))
+
+def cache_dir(*parts):
+    path = CACHE_DIR.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding=encoding)
+    os.replace(tmp, path)
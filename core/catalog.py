@@ -0,0 +1,168 @@
+import importlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+
+from core.cache import cache_dir, atomic_write_text
+from core.elements import iter_exposed_classes, get_class_init_params
+from core.schema import ClassSchema
+
+CATALOG_FORMAT = 2
+
+def manim_fingerprint(package_name: str = "manim"):
+    spec = importlib.util.find_spec(package_name)
+    if spec is None or not spec.origin:
+        return None
+    root = os.path.dirname(spec.origin)
+    try:
+        version = importlib.metadata.version(package_name)
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    mtime = max(os.stat(root).st_mtime_ns, os.stat(spec.origin).st_mtime_ns)
+    return {"format": CATALOG_FORMAT, "version": version, "mtime": mtime, "path": root}
+
+def catalog_path(fingerprint):
+    return cache_dir("catalog") / f"manim-{fingerprint['version']}.json"
+
+def _jsonable_default(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value, False
+    return repr(value), True
+
+def _is_subclass(cls, base):
+    try:
+        return base is not None and issubclass(cls, base)
+    except Exception:
+        return False
+
+def describe_class(cls, animation_base=None, mobject_base=None):
+    params = {}
+    for name, info in get_class_init_params(cls).items():
+        default, is_repr = _jsonable_default(info["default"])
+        params[name] = dict(info, default=default)
+        if is_repr:
+            params[name]["repr"] = True
+    return {
+        "name": cls.__name__,
+        "module": cls.__module__,
+        "qualname": cls.__qualname__,
+        "is_animation": _is_subclass(cls, animation_base),
+        "is_mobject": _is_subclass(cls, mobject_base),
+        "params": params,
+    }
+
+def iter_catalog_batches(package_name: str = "manim"):
+    package = importlib.import_module(package_name)
+    animation_base = getattr(package, "Animation", None)
+    mobject_base = getattr(package, "Mobject", None)
+    names = set()
+    for classes in iter_exposed_classes(package_name):
+        batch = []
+        for cls in classes:
+            if cls.__name__ in names:
+                continue
+            try:
+                batch.append(describe_class(cls, animation_base, mobject_base))
+            except Exception:
+                continue
+            names.add(cls.__name__)
+        if batch:
+            yield batch
+
+def build_catalog(package_name: str = "manim"):
+    return [entry for batch in iter_catalog_batches(package_name) for entry in batch]
+
+def read_catalog(fingerprint):
+    path = catalog_path(fingerprint)
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("fingerprint") != fingerprint:
+        return None
+    return data.get("classes")
+
+def write_catalog(fingerprint, entries):
+    payload = {"fingerprint": fingerprint, "classes": entries}
+    atomic_write_text(catalog_path(fingerprint), json.dumps(payload))
+
+def iter_catalog(package_name: str = "manim", chunk_size: int = 400):
+    fingerprint = manim_fingerprint(package_name)
+    entries = read_catalog(fingerprint) if fingerprint else None
+    if entries is not None:
+        for i in range(0, len(entries), chunk_size):
+            yield entries[i:i + chunk_size]
+        return
+    entries = []
+    for batch in iter_catalog_batches(package_name):
+        entries.extend(batch)
+        yield batch
+    if fingerprint:
+        write_catalog(fingerprint, entries)
+
+def load_catalog(package_name: str = "manim"):
+    return ClassCatalog(entry for batch in iter_catalog(package_name) for entry in batch)
+
+class ClassCatalog:
+    def __init__(self, entries=()):
+        self.entries = {}
+        self._classes = {}
+        self._schemas = {}
+        self.extend(entries)
+
+    def extend(self, entries):
+        added = []
+        for entry in entries:
+            if entry["name"] not in self.entries:
+                self.entries[entry["name"]] = entry
+                added.append(entry["name"])
+        return added
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def names(self):
+        return list(self.entries)
+
+    def entry(self, name):
+        return self.entries.get(name)
+
+    def is_animation(self, name):
+        entry = self.entries.get(name)
+        return bool(entry and entry["is_animation"])
+
+    def is_mobject(self, name):
+        entry = self.entries.get(name)
+        return bool(entry and entry["is_mobject"])
+
+    def params(self, name):
+        entry = self.entries.get(name)
+        return entry["params"] if entry else {}
+
+    def schema(self, name):
+        # compiled once per class; edits and code generation only do lookups afterwards
+        schema = self._schemas.get(name)
+        if schema is None and name in self.entries:
+            schema = self._schemas[name] = ClassSchema(name, self.entries[name]["params"])
+        return schema
+
+    def get_class(self, name):
+        if name in self._classes:
+            return self._classes[name]
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        try:
+            cls = importlib.import_module(entry["module"])
+            for part in entry["qualname"].split("."):
+                cls = getattr(cls, part)
+        except Exception:
+            cls = None
+        self._classes[name] = cls
+        return cls
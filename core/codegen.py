@@ -0,0 +1,128 @@
+import re
+
+INDENT = " " * 8
+SCENE_HEADER = ["from manim import *", "", "class Output(Scene):", "    def construct(self):"]
+
+def format_param(k, v):
+    if isinstance(v, str):
+        if v.startswith("!") and v.endswith("!"):
+            return None
+        elif v.startswith("$") and v.endswith("$"):
+            inner = v[1:-1]
+            return f"{k}={inner}"
+        else:
+            return f"{k}={repr(v)}"
+    else:
+        return f"{k}={v}"
+
+def format_args(params, schema=None):
+    parts = []
+    for k, v in params.items():
+        param = schema.get(k) if schema else None
+        if param is None:
+            part = format_param(k, v)
+        else:
+            code = param.emit(v)
+            part = None if code is None else f"{k}={code}"
+        if part:
+            parts.append(part)
+    return ", ".join(parts)
+
+def var_name_for(name):
+    return re.sub(r"[^0-9a-zA-Z_]+", "_", name).lower()
+
+def split_display_name(name):
+    base = name.split(" (")[0]
+    cls_name = name.split(" (")[1][:-1] if "(" in name else name
+    return base, cls_name
+
+def element_line(cls_name, var_name, is_animation, params, schema=None):
+    args = format_args(params, schema)
+    if is_animation:
+        return f"{INDENT}self.play({cls_name}({args}))"
+    return f"{INDENT}{var_name} = {cls_name}({args})"
+
+def sound_line(path):
+    return f'{INDENT}self.add_sound(r"{path}")'
+
+def scene_frame(sound_path=None, ai_code=""):
+    if not ai_code:
+        header = list(SCENE_HEADER)
+        if sound_path:
+            header.append(sound_line(sound_path))
+        return header, [], True
+    lines = ai_code.splitlines()
+    insert_idx = None
+    for i, line in enumerate(lines):
+        if line.strip().startswith("def construct"):
+            insert_idx = i + 1
+            break
+    if not insert_idx:
+        return lines, [], False
+    header, footer = lines[:insert_idx], lines[insert_idx:]
+    if sound_path and "self.add_sound" not in ai_code:
+        header.append(sound_line(sound_path))
+    return header, footer, True
+
+def generate_script(props_data, catalog, sound_path=None, ai_code=""):
+    header, footer, accepts_elements = scene_frame(sound_path, ai_code)
+    body = []
+    if accepts_elements:
+        for name, params in props_data.items():
+            base, cls_name = split_display_name(name)
+            if cls_name not in catalog:
+                continue
+            body.append(element_line(
+                cls_name, var_name_for(base), catalog.is_animation(cls_name), params, catalog.schema(cls_name)
+            ))
+    return "\n".join(header + body + footer)
+
+class CodeModel:
+    def __init__(self):
+        self.header = []
+        self.footer = []
+        self.keys = []
+        self._specs = {}
+        self._lines = {}
+        self._text = None
+        self._positions = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            body = [self._lines[k] for k in self.keys]
+            self._text = "\n".join(self.header + body + self.footer)
+        return self._text
+
+    def line_span(self, key):
+        if self._positions is None:
+            self._positions = {k: i for i, k in enumerate(self.keys)}
+        position = self._positions.get(key)
+        return None if position is None else len(self.header) + position
+
+    def update(self, header, footer, elements):
+        # elements: iterable of (key, cls_name, var_name, is_animation, params, schema)
+        keys = []
+        changed = []
+        for key, cls_name, var_name, is_animation, params, schema in elements:
+            spec = (cls_name, var_name, is_animation, params)
+            if self._specs.get(key) != spec:
+                self._specs[key] = (cls_name, var_name, is_animation, dict(params))
+                self._lines[key] = element_line(cls_name, var_name, is_animation, params, schema)
+                changed.append(key)
+            keys.append(key)
+
+        structural = header != self.header or footer != self.footer or keys != self.keys
+        for key in set(self._specs).difference(keys):
+            del self._specs[key]
+            del self._lines[key]
+        self.header, self.footer, self.keys = list(header), list(footer), keys
+        if not structural and not changed:
+            return []
+        self._text = None
+        if structural:
+            self._positions = None
+            return None
+        offset = len(self.header)
+        positions = {k: i for i, k in enumerate(keys)}
+        return [(offset + positions[k], self._lines[k]) for k in changed]
@@ -1,68 +1,59 @@
-from manim import Animation
 import inspect
 import importlib
 import pkgutil
 
-def get_exposed_classes(package_name: str = "manim"):
+from core.signatures import resolve_params
+
+def iter_exposed_classes(package_name: str = "manim"):
     package = importlib.import_module(package_name)
-    classes = set()
+    seen = set()
     visited = set()
 
     def walk_module(mod):
-        if mod in visited:
-            return
-        visited.add(mod)
-        for attr_name in dir(mod):
-            if attr_name.startswith("_"):
-                continue
-            try:
-                attr = getattr(mod, attr_name)
-                if inspect.isclass(attr):
-                    classes.add(attr)
-                elif inspect.ismodule(attr) and attr.__name__.startswith(package_name):
-                    walk_module(attr)
-            except Exception:
+        stack = [mod]
+        while stack:
+            mod = stack.pop()
+            if mod in visited:
                 continue
-
-    walk_module(package)
+            visited.add(mod)
+            batch = []
+            for attr_name in dir(mod):
+                if attr_name.startswith("_"):
+                    continue
+                try:
+                    attr = getattr(mod, attr_name)
+                    if inspect.isclass(attr):
+                        if attr not in seen:
+                            seen.add(attr)
+                            batch.append(attr)
+                    elif inspect.ismodule(attr) and attr.__name__.startswith(package_name):
+                        stack.append(attr)
+                except Exception:
+                    continue
+            if batch:
+                yield batch
+
+    yield from walk_module(package)
 
     for _, name, _ in pkgutil.walk_packages(package.__path__, package.__name__ + "."):
         try:
             mod = importlib.import_module(name)
-            walk_module(mod)
         except Exception:
             continue
+        yield from walk_module(mod)
 
-    return list(classes)
+def get_exposed_classes(package_name: str = "manim"):
+    return [cls for batch in iter_exposed_classes(package_name) for cls in batch]
 
 def get_class_init_params(cls):
-    props = {}
     try:
-        sig = inspect.signature(cls)
-    except (TypeError, ValueError):
-        return props
-
-    for name, param in sig.parameters.items():
-        if name == "self":
-            continue
-        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
-            continue
-
-        param_type = (
-            param.annotation.__name__
-            if hasattr(param.annotation, "__name__")
-            else str(param.annotation)
-            if param.annotation is not inspect.Parameter.empty
-            else "str"
-        )
-        default = (
-            param.default if param.default is not inspect.Parameter.empty else ""
-        )
-        props[name] = {"type": param_type, "default": default}
-    return props
+        return resolve_params(cls)
+    except Exception:
+        return {}
 
 def class_in_manim_animations(cls):
     try:
+        from manim import Animation
         return inspect.isclass(cls) and issubclass(cls, Animation)
     except Exception:
         return False
@@ -0,0 +1,114 @@
+import hashlib
+import time
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+
+from core.telemetry import caller_line
+
+PREVIEW_WIDTH = 480
+PREVIEW_FPS = 15
+
+def preview_size(width, height, max_width=PREVIEW_WIDTH):
+    scale = min(1.0, max_width / max(1, width))
+    # cairo strides and most codecs are happier with even dimensions
+    return max(2, round(width * scale) // 2 * 2), max(2, round(height * scale) // 2 * 2)
+
+def frames_key(source, width, height, fps=PREVIEW_FPS):
+    return hashlib.sha1(f"{width}x{height}@{fps}\n{source}".encode("utf-8")).hexdigest()
+
+class FrameCache:
+    def __init__(self, budget=256 * 1024 * 1024):
+        self.budget = budget
+        self.size = 0
+        self._plays = OrderedDict()
+
+    def _cost(self, frames):
+        return sum(len(f) for f in {id(f): f for f in frames}.values())
+
+    def get(self, key, play):
+        frames = self._plays.get((key, play))
+        if frames is not None:
+            self._plays.move_to_end((key, play))
+        return frames
+
+    def put(self, key, play, frames):
+        old = self._plays.pop((key, play), None)
+        if old is not None:
+            self.size -= self._cost(old)
+        self._plays[(key, play)] = frames
+        self.size += self._cost(frames)
+        while self.size > self.budget and len(self._plays) > 1:
+            _, evicted = self._plays.popitem(last=False)
+            self.size -= self._cost(evicted)
+
+    def clear(self):
+        self._plays.clear()
+        self.size = 0
+
+def run_frames(job, emit):
+    from manim import tempconfig
+
+    from core.render_daemon import load_scene_class
+
+    workdir = Path(job["workdir"])
+    workdir.mkdir(parents=True, exist_ok=True)
+    module_name = job.get("module", "preview_scene")
+    script = workdir / f"{module_name}.py"
+    script.write_text(job["source"], encoding="utf-8")
+    target = int(job.get("play", 1))
+    overrides = {
+        "input_file": str(script),
+        "media_dir": str(workdir / "media"),
+        "pixel_width": job["width"],
+        "pixel_height": job["height"],
+        "frame_rate": job.get("fps", PREVIEW_FPS),
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+        "progress_bar": "none",
+    }
+    started = time.perf_counter()
+    try:
+        with tempconfig(overrides):
+            scene = load_scene_class(script, module_name, job.get("scene"))()
+            renderer = scene.renderer
+            timeline = []
+            captured = []
+            play = scene.play
+
+            def capture(frame, num_frames=1):
+                if not renderer.skip_animations:
+                    # the camera reuses its pixel array, so each frame has to be snapshotted once;
+                    # held frames repeat the same bytes object instead of copying it again
+                    data = frame.tobytes()
+                    captured.extend([data] * max(1, int(num_frames)))
+
+            def wrapped(*args, **kwargs):
+                index = len(timeline) + 1
+                line = caller_line(str(script))
+                skipping = renderer._original_skipping_status
+                renderer._original_skipping_status = skipping or index != target
+                try:
+                    result = play(*args, **kwargs)
+                finally:
+                    renderer._original_skipping_status = skipping
+                timeline.append({"play": index, "line": line, "duration": scene.duration})
+                if index == target:
+                    frames = list(captured) or [renderer.get_frame().tobytes()]
+                    emit({"event": "frames", "play": index, "frames": frames})
+                return result
+
+            renderer.add_frame = capture
+            scene.play = wrapped
+            scene.add_sound = lambda *args, **kwargs: None
+            scene.render()
+            if not timeline or target > len(timeline):
+                renderer.update_frame(scene)
+                emit({"event": "frames", "play": 0, "frames": [renderer.get_frame().tobytes()]})
+        emit({
+            "event": "done", "output": "", "timeline": timeline,
+            "width": job["width"], "height": job["height"], "elapsed": time.perf_counter() - started,
+        })
+    except Exception:
+        emit({"event": "error", "text": traceback.format_exc()})
@@ -0,0 +1,98 @@
+import time
+from collections import deque, namedtuple
+from types import MappingProxyType
+
+ElementRecord = namedtuple("ElementRecord", "uid name cls_name props")
+
+def make_record(uid, name, cls_name, props):
+    # records are never mutated, so consecutive steps can share them freely
+    return ElementRecord(uid, name, cls_name, MappingProxyType(dict(props)))
+
+def record_cost(record):
+    if record is None:
+        return 16
+    _, rec = record
+    return 96 + len(rec.name) + sum(len(k) + len(repr(v)) for k, v in rec.props.items())
+
+class Step:
+    __slots__ = ("label", "changes", "frame", "coalesce", "time", "cost")
+
+    def __init__(self, label, changes, frame=None, coalesce=None):
+        # changes: uid -> (before, after); each side is None or (index, ElementRecord)
+        self.label = label
+        self.changes = changes
+        self.frame = frame
+        self.coalesce = coalesce
+        self.time = time.monotonic()
+        self.cost = self._cost()
+
+    def _cost(self):
+        cost = 128
+        for before, after in self.changes.values():
+            cost += record_cost(before) + record_cost(after)
+        if self.frame:
+            cost += sum(len(str(v)) for side in self.frame for v in side)
+        return cost
+
+    def merge(self, other):
+        for uid, (_, after) in other.changes.items():
+            before = self.changes[uid][0] if uid in self.changes else other.changes[uid][0]
+            self.changes[uid] = (before, after)
+        if other.frame:
+            self.frame = (self.frame[0] if self.frame else other.frame[0], other.frame[1])
+        self.time = other.time
+        self.cost = self._cost()
+
+class History:
+    def __init__(self, budget=16 * 1024 * 1024, max_steps=1000, coalesce_window=1.0):
+        self.budget = budget
+        self.max_steps = max_steps
+        self.coalesce_window = coalesce_window
+        self.undo_steps = deque()
+        self.redo_steps = []
+        self.size = 0
+        self.suspended = False
+
+    def clear(self):
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self.size = 0
+
+    def commit(self, label, changes, frame=None, coalesce=None):
+        if self.suspended or (not changes and not frame):
+            return
+        step = Step(label, changes, frame, coalesce)
+        self.redo_steps.clear()
+        last = self.undo_steps[-1] if self.undo_steps else None
+        if (coalesce is not None and last is not None and last.coalesce == coalesce
+                and step.time - last.time < self.coalesce_window):
+            self.size -= last.cost
+            last.merge(step)
+            self.size += last.cost
+            return
+        self.undo_steps.append(step)
+        self.size += step.cost
+        while self.undo_steps and (self.size > self.budget or len(self.undo_steps) > self.max_steps):
+            self.size -= self.undo_steps.popleft().cost
+
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    def undo(self):
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self.size -= step.cost
+        self.redo_steps.append(step)
+        return step
+
+    def redo(self):
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self.undo_steps.append(step)
+        self.size += step.cost
+        return step
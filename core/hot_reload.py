@@ -0,0 +1,18 @@
+from core.segments import segment_keys
+
+# only ever compared with each other, so any fixed config keeps the keys stable between edits
+DIFF_CONFIG = {"purpose": "hot_reload"}
+
+def play_keys(source):
+    return segment_keys(source, DIFF_CONFIG)
+
+def first_changed(previous, current):
+    # index of the first self.play/self.wait whose output can differ, None when every animation is unchanged
+    if previous is None or current is None:
+        return 0
+    for index, (old, new) in enumerate(zip(previous, current)):
+        if old != new:
+            return index
+    if len(previous) != len(current):
+        return min(len(previous), len(current))
+    return None
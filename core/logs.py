@@ -0,0 +1,73 @@
+import itertools
+import queue
+import re
+import time
+from collections import deque
+from pathlib import Path
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+LEVEL_RE = re.compile(r"\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b")
+
+def guess_level(text):
+    if text.startswith("Traceback") or "Error:" in text or "Exception" in text:
+        return "ERROR"
+    m = LEVEL_RE.search(text[:40])
+    return m.group(1) if m else "INFO"
+
+class LogRecord:
+    __slots__ = ("time", "source", "level", "text")
+
+    def __init__(self, source, text, level=None):
+        self.time = time.time()
+        self.source = source
+        self.level = level or guess_level(text)
+        self.text = text
+
+    def format(self):
+        stamp = time.strftime("%H:%M:%S", time.localtime(self.time))
+        return f"{stamp} [{self.source}] {self.text}"
+
+class LogBuffer:
+    def __init__(self, capacity=5000, spill_path=None):
+        self.capacity = capacity
+        self.records = deque(maxlen=capacity)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.sources = set()
+        self._inbox = queue.SimpleQueue()
+
+    def push(self, source, text, level=None):
+        # safe from any thread; nothing touches Qt until drain() runs on the GUI timer
+        for line in str(text).splitlines() or [""]:
+            self._inbox.put(LogRecord(source, line, level))
+
+    def drain(self, limit=5000):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._inbox.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return batch
+        overflow = len(self.records) + len(batch) - self.capacity
+        if overflow > 0 and self.spill_path:
+            evicted = list(itertools.islice(self.records, overflow)) + batch[:max(0, overflow - len(self.records))]
+            self._spill(evicted)
+        self.records.extend(batch)
+        for record in batch:
+            self.sources.add(record.source)
+        return batch
+
+    def _spill(self, records):
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open("a", encoding="utf-8") as fh:
+            fh.write("".join(f"{r.format()}\n" for r in records))
+
+    def filtered(self, min_level="DEBUG", source=None, records=None):
+        floor = LEVELS.get(min_level, 0)
+        for record in self.records if records is None else records:
+            if LEVELS.get(record.level, 20) < floor:
+                continue
+            if source and record.source != source:
+                continue
+            yield record
@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+_pool = None
+_pool_size = 0
+
+def get_pool(workers):
+    global _pool, _pool_size
+    if _pool is None or _pool_size != workers:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_size = workers
+    return _pool
+
+def default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+def plan_chunks(indices, chunk_size):
+    chunks = []
+    for index in indices:
+        if chunks and index == chunks[-1][1] + 1 and index - chunks[-1][0] < chunk_size:
+            chunks[-1][1] = index
+        else:
+            chunks.append([index, index])
+    return [tuple(c) for c in chunks]
+
+def render_chunk(script, module_name, scene_name, overrides, start, end, media_dir):
+    from manim import tempconfig
+    from core.render_daemon import load_scene_class
+
+    started = time.time()
+    chunk_config = dict(
+        overrides,
+        media_dir=media_dir,
+        from_animation_number=start,
+        upto_animation_number=end,
+        progress_bar="none",
+    )
+    with tempconfig(chunk_config):
+        scene = load_scene_class(script, module_name, scene_name)()
+        scene.render()
+        writer = scene.renderer.file_writer
+        sections = getattr(writer, "sections", None)
+        if sections:
+            files = [f for section in sections for f in section.partial_movie_files]
+        else:
+            files = list(writer.partial_movie_files)
+    files = files[start:end + 1]
+    if len(files) != end - start + 1 or not all(files):
+        raise RuntimeError(f"Animations {start}-{end} did not produce partial movies")
+    return {"files": files, "start": started, "end": time.time(), "pid": os.getpid()}
+
+def concat_movies(paths, output):
+    import av
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    list_file = output.with_name(f"{output.stem}_segments.txt")
+    lines = ["ffconcat version 1.0"] + [f"file '{Path(p).as_posix()}'" for p in paths]
+    list_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with av.open(str(list_file), format="concat", options={"safe": "0"}) as src:
+        with av.open(str(output), mode="w") as dst:
+            stream = src.streams.video[0]
+            if hasattr(dst, "add_stream_from_template"):
+                out = dst.add_stream_from_template(stream)
+            else:
+                out = dst.add_stream(template=stream)
+            for packet in src.demux(stream):
+                # demux yields empty flushing packets at the end of each input
+                if packet.dts is None:
+                    continue
+                packet.stream = out
+                dst.mux(packet)
+    list_file.unlink()
+    return output
+
+def render_parallel(job, script, module_name, scene_name, overrides, keys, cache, emit, telemetry=None):
+    from manim import config
+
+    suffix = config.movie_file_extension
+    workers = max(1, int(job.get("workers", 1)))
+    chunk_size = max(1, int(job.get("chunk_size", 1)))
+    segments = [cache.get(key, suffix) if cache else None for key in keys]
+    missing = [i for i, path in enumerate(segments) if path is None]
+    chunks = plan_chunks(missing, chunk_size)
+    emit({"event": "log", "level": "INFO",
+          "text": f"Rendering {len(missing)} of {len(keys)} animations in {len(chunks)} chunks on {workers} workers"})
+
+    chunk_root = Path(job["workdir"]) / ".parallel"
+    pool = get_pool(workers)
+    # workers report wall-clock times; shift them onto this process's perf_counter timeline
+    clock_offset = time.perf_counter() - time.time()
+    futures = {
+        pool.submit(render_chunk, str(script), module_name, scene_name, overrides,
+                    start, end, str(chunk_root / f"chunk{start}")): (start, end)
+        for start, end in chunks
+    }
+    for future in as_completed(futures):
+        start, end = futures[future]
+        result = future.result()
+        if telemetry:
+            telemetry.span("segment", result["start"] + clock_offset, result["end"] + clock_offset,
+                           play=start + 1, plays=end - start + 1, worker=result["pid"])
+        for offset, path in enumerate(result["files"]):
+            index = start + offset
+            segments[index] = cache.put(keys[index], path) if cache else Path(path)
+            emit({"event": "progress", "play": index + 1, "cached": False})
+
+    hits = len(keys) - len(missing)
+    output = config.get_dir("video_dir", module_name=module_name) / f"{scene_name}{suffix}"
+    if telemetry:
+        with telemetry.measure("encode"):
+            concat_movies(segments, output)
+    else:
+        concat_movies(segments, output)
+    return output, hits
@@ -0,0 +1,102 @@
+import json
+import sqlite3
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS elements (
+    uid INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    cls TEXT NOT NULL,
+    props TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS elements_position ON elements(position);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+class ProjectStore:
+    def __init__(self, path="project.db"):
+        self.path = Path(path)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        # what the database currently holds, so saves can skip untouched rows
+        self._saved = {}
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM elements").fetchone()[0]
+
+    def max_uid(self):
+        return self.db.execute("SELECT COALESCE(MAX(uid), 0) FROM elements").fetchone()[0]
+
+    def iter_elements(self, batch_size=500):
+        cursor = self.db.execute("SELECT uid, position, name, cls, props FROM elements ORDER BY position")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            batch = []
+            for uid, position, name, cls_name, props in rows:
+                self._saved[uid] = (position, name, cls_name, props)
+                batch.append({"uid": uid, "name": name, "cls": cls_name, "props": json.loads(props)})
+            yield batch
+
+    def sync(self, elements):
+        # elements: ordered iterable of (uid, name, cls_name, props)
+        upserts = []
+        seen = set()
+        for position, (uid, name, cls_name, props) in enumerate(elements):
+            row = (position, name, cls_name, json.dumps(props, sort_keys=True))
+            seen.add(uid)
+            if self._saved.get(uid) != row:
+                upserts.append((uid,) + row)
+                self._saved[uid] = row
+        removed = [uid for uid in self._saved if uid not in seen]
+        if not upserts and not removed:
+            return 0, 0
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO elements (uid, position, name, cls, props) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(uid) DO UPDATE SET position=excluded.position, name=excluded.name, "
+                "cls=excluded.cls, props=excluded.props",
+                upserts,
+            )
+            self.db.executemany("DELETE FROM elements WHERE uid = ?", [(uid,) for uid in removed])
+        for uid in removed:
+            del self._saved[uid]
+        return len(upserts), len(removed)
+
+    def settings(self):
+        return {key: json.loads(value) for key, value in self.db.execute("SELECT key, value FROM settings")}
+
+    def save_settings(self, values):
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO settings (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                [(key, json.dumps(value)) for key, value in values.items()],
+            )
+
+    def import_props(self, props_data, split_name):
+        # props.json interchange: {"var (Class)": {...}} in scene order, appended after existing elements
+        uid, position = self.max_uid() + 1, len(self)
+        rows = [
+            (uid + i, position + i, name, split_name(name)[1], json.dumps(props, sort_keys=True))
+            for i, (name, props) in enumerate(props_data.items())
+        ]
+        with self.db:
+            self.db.executemany("INSERT INTO elements (uid, position, name, cls, props) VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def export_props(self):
+        return {
+            name: json.loads(props)
+            for name, props in self.db.execute("SELECT name, props FROM elements ORDER BY position")
+        }
@@ -0,0 +1,28 @@
+DRAFT_LABEL = "Preview draft"
+MEDIUM_LABEL = "Preview 480p15"
+FULL_LABEL = "Preview full quality"
+LADDER_LABELS = (DRAFT_LABEL, MEDIUM_LABEL, FULL_LABEL)
+
+# (label, pixel height, frame rate); the last rung always uses the chosen resolution
+RUNGS = ((DRAFT_LABEL, 144, 10), (MEDIUM_LABEL, 480, 15))
+FULL_FPS = 60
+
+def even(value):
+    # video encoders want even dimensions
+    return max(2, int(round(value / 2)) * 2)
+
+def quality_ladder(width, height, fps=FULL_FPS):
+    ladder = []
+    for label, rung_height, rung_fps in RUNGS:
+        if rung_height >= height:
+            continue
+        ladder.append((label, {
+            "pixel_width": even(width * rung_height / height),
+            "pixel_height": rung_height,
+            "frame_rate": rung_fps,
+        }))
+    ladder.append((FULL_LABEL, {"pixel_width": width, "pixel_height": height, "frame_rate": fps}))
+    return ladder
+
+def ladder_rank(label):
+    return LADDER_LABELS.index(label) if label in LADDER_LABELS else None
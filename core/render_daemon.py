@@ -0,0 +1,311 @@
+import importlib.util
+import inspect
+import logging
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+from core.frames import run_frames
+from core.parallel_render import render_parallel
+from core.processes import kill_process_tree, new_group_kwargs
+from core.segments import SegmentCache, render_config_key, segment_keys, uses_updaters
+from core.telemetry import Telemetry, caller_line
+from core.validate import run_validate
+
+KEY_ENV = "MAGICALMANIM_DAEMON_KEY"
+ROOT = Path(__file__).resolve().parent.parent
+
+class _ForwardHandler(logging.Handler):
+    def __init__(self, emit):
+        super().__init__(logging.INFO)
+        self._emit = emit
+
+    def emit(self, record):
+        try:
+            self._emit({"event": "log", "level": record.levelname, "text": record.getMessage()})
+        except Exception:
+            pass
+
+def load_scene_class(script, module_name, scene_name=None):
+    from manim import Scene
+
+    spec = importlib.util.spec_from_file_location(module_name, script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.modules.pop(module_name, None)
+    scenes = [
+        obj for obj in vars(module).values()
+        if inspect.isclass(obj) and issubclass(obj, Scene) and obj.__module__ == module_name
+    ]
+    if scene_name:
+        scenes = [s for s in scenes if s.__name__ == scene_name]
+    if not scenes:
+        raise RuntimeError(f"No scene to render in {script}")
+    return scenes[0]
+
+def partial_movie_files(writer):
+    sections = getattr(writer, "sections", None)
+    if sections:
+        return sections[-1].partial_movie_files
+    return writer.partial_movie_files
+
+def instrument_scene(scene, emit, keys=None, cache=None, suffix=".mp4", telemetry=None, script=None):
+    play = scene.play
+    stats = {"plays": 0, "hits": 0}
+    if not hasattr(scene.renderer, "_original_skipping_status"):
+        keys = None
+
+    def wrapped(*args, **kwargs):
+        started = time.perf_counter()
+        line = caller_line(script) if script else None
+        index = stats["plays"]
+        key = keys[index] if keys and index < len(keys) else None
+        cached = cache.get(key, suffix) if key else None
+        renderer = scene.renderer
+        if cached:
+            skipping = renderer._original_skipping_status
+            renderer._original_skipping_status = True
+            try:
+                result = play(*args, **kwargs)
+            finally:
+                renderer._original_skipping_status = skipping
+        else:
+            result = play(*args, **kwargs)
+        files = partial_movie_files(renderer.file_writer) if key else None
+        if cached and files:
+            files[-1] = str(cached)
+            stats["hits"] += 1
+        elif files and files[-1] and os.path.exists(files[-1]):
+            cache.put(key, files[-1])
+        stats["plays"] += 1
+        if telemetry:
+            from manim import config
+
+            frames = 0 if cached else round(scene.duration * config.frame_rate)
+            telemetry.span("play", started, time.perf_counter(),
+                           play=stats["plays"], line=line, frames=frames, cached=bool(cached))
+        emit({"event": "progress", "play": stats["plays"], "cached": bool(cached)})
+        return result
+
+    scene.play = wrapped
+    if telemetry:
+        finished = scene.renderer.scene_finished
+
+        def timed_finish(*args, **kwargs):
+            with telemetry.measure("encode"):
+                return finished(*args, **kwargs)
+
+        scene.renderer.scene_finished = timed_finish
+    return stats
+
+def route_sounds(scene, length, emit):
+    # every render reads the transcoded, trimmed WAV instead of decoding the original track again
+    from core.audio import AudioCache
+
+    cache = AudioCache()
+    add_sound = scene.add_sound
+
+    def cached_sound(sound_file, *args, **kwargs):
+        try:
+            sound_file = str(cache.render_ready(sound_file, length or None))
+        except Exception as e:
+            emit({"event": "log", "level": "WARNING", "text": f"Audio cache skipped for {sound_file}: {e}"})
+        return add_sound(sound_file, *args, **kwargs)
+
+    scene.add_sound = cached_sound
+
+def run_job(job, emit):
+    from manim import tempconfig
+
+    workdir = Path(job["workdir"])
+    workdir.mkdir(parents=True, exist_ok=True)
+    module_name = job.get("module", "temp_scene")
+    script = workdir / f"{module_name}.py"
+    script.write_text(job["source"], encoding="utf-8")
+    overrides = {"input_file": str(script), "progress_bar": "none"}
+    overrides.update(job.get("config", {}))
+
+    cache = SegmentCache() if job.get("segment_cache", True) else None
+    telemetry = Telemetry(emit)
+    handler = _ForwardHandler(emit)
+    logger = logging.getLogger("manim")
+    logger.addHandler(handler)
+    try:
+        with tempconfig(overrides):
+            from manim import __version__, config
+
+            with telemetry.measure("load"):
+                scene_cls = load_scene_class(script, module_name, job.get("scene"))
+            keys = None
+            if config.write_to_movie and not config.disable_caching:
+                keys = segment_keys(job["source"], render_config_key(config, __version__), scene_cls.__name__)
+                if keys is not None and uses_updaters(job["source"]):
+                    keys = None
+                    emit({"event": "log", "level": "INFO",
+                          "text": "Segment cache off: the scene uses updaters, which only match a serial render"})
+                elif keys is None:
+                    emit({"event": "log", "level": "INFO",
+                          "text": "Segment cache off: construct() is not a straight list of self.play calls"})
+            parallel = job.get("workers", 1) > 1 and bool(keys) and "add_sound" not in job["source"]
+            if job.get("workers", 1) > 1 and not parallel:
+                emit({"event": "log", "level": "INFO", "text": "Scene can't be split into segments, rendering serially"})
+            emit({"event": "log", "level": "INFO", "text": f"Rendering {scene_cls.__name__}"})
+            if parallel:
+                output, hits = render_parallel(
+                    job, script, module_name, scene_cls.__name__, overrides, keys, cache, emit, telemetry
+                )
+                plays = len(keys)
+            else:
+                with telemetry.measure("setup"):
+                    scene = scene_cls()
+                    route_sounds(scene, job.get("scene_length"), emit)
+                stats = instrument_scene(
+                    scene, emit, keys if cache else None, cache, config.movie_file_extension,
+                    telemetry, str(script),
+                )
+                with telemetry.measure("render", scene=scene_cls.__name__):
+                    scene.render()
+                writer = scene.renderer.file_writer
+                output = getattr(writer, "movie_file_path", None) or getattr(writer, "image_file_path", None)
+                hits, plays = stats["hits"], stats["plays"]
+            if cache is not None and keys is not None:
+                emit({"event": "cache", "hits": hits, "total": plays})
+                cache.prune()
+            emit({"event": "done", "output": str(output) if output else ""})
+    except Exception:
+        emit({"event": "error", "text": traceback.format_exc()})
+    finally:
+        logger.removeHandler(handler)
+
+JOB_KINDS = {"render": run_job, "frames": run_frames, "validate": run_validate}
+
+def serve(conn):
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        JOB_KINDS.get(job.get("kind", "render"), run_job)(job, conn.send)
+
+def main():
+    authkey = bytes.fromhex(os.environ.pop(KEY_ENV))
+    listener = Listener(("127.0.0.1", 0), authkey=authkey)
+    host, port = listener.address
+    print(f"{host}:{port}", flush=True)
+    import manim  # noqa: F401  keep manim warm for every job
+    conn = listener.accept()
+    listener.close()
+    try:
+        serve(conn)
+    finally:
+        conn.close()
+
+class RenderDaemon:
+    def __init__(self):
+        self._proc = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self.output = deque(maxlen=200)
+
+    def is_alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def _drain(self, stream):
+        for line in stream:
+            self.output.append(line.rstrip())
+
+    def ensure_started(self):
+        if self.is_alive() and self._conn is not None:
+            return
+        self.stop()
+        authkey = secrets.token_bytes(16)
+        env = dict(os.environ, **{KEY_ENV: authkey.hex()})
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "core.render_daemon"],
+            cwd=str(ROOT), env=env, text=True,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            **new_group_kwargs(),
+        )
+        address = self._proc.stdout.readline().strip()
+        if not address:
+            self._proc.wait()
+            raise RuntimeError("Render worker failed to start")
+        host, port = address.rsplit(":", 1)
+        threading.Thread(target=self._drain, args=(self._proc.stdout,), daemon=True).start()
+        self._conn = Client((host, int(port)), authkey=authkey)
+
+    def warm_up(self):
+        threading.Thread(target=self._warm_up, daemon=True).start()
+
+    def _warm_up(self):
+        with self._lock:
+            try:
+                self.ensure_started()
+            except Exception:
+                pass
+
+    def submit(self, job):
+        with self._lock:
+            try:
+                yield from self._submit(job)
+            finally:
+                self._cancelled = False
+
+    def _submit(self, job):
+        # a cancel that arrived before the lock was taken still applies to this job
+        if self._cancelled:
+            self.stop()
+            yield {"event": "cancelled"}
+            return
+        received = False
+        for attempt in range(2):
+            try:
+                self.ensure_started()
+                self._conn.send(job)
+                while True:
+                    msg = self._conn.recv()
+                    received = True
+                    yield msg
+                    if msg["event"] in ("done", "error"):
+                        return
+            except (EOFError, OSError, RuntimeError) as e:
+                # teardown and reaping happen here, on the thread that owns the connection
+                self.stop()
+                if self._cancelled:
+                    yield {"event": "cancelled"}
+                    return
+                tail = "\n".join(list(self.output)[-20:])
+                if received or attempt:
+                    yield {"event": "error", "text": f"Render worker crashed: {e}\n{tail}".rstrip()}
+                    return
+                yield {"event": "log", "level": "WARNING", "text": "Render worker was down, restarting"}
+
+    def cancel(self):
+        # dropping the worker is the only way to interrupt a render mid-frame. Only the
+        # process is killed here; the submitting thread sees the broken pipe and cleans up
+        self._cancelled = True
+        kill_process_tree(self._proc, wait=False)
+
+    def stop(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+        kill_process_tree(self._proc)
+        self._proc = None
+
+if __name__ == "__main__":
+    main()
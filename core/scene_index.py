@@ -0,0 +1,202 @@
+import ast
+import textwrap
+
+WRAPPER = "class DummyScene(Scene):\n"
+
+class SceneElement:
+    __slots__ = ("cls_name", "var_name", "params", "span")
+
+    def __init__(self, cls_name, var_name, params, span):
+        self.cls_name = cls_name
+        self.var_name = var_name
+        self.params = params
+        self.span = span
+
+def _base_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ""
+
+def _is_self_method(call):
+    return (
+        isinstance(call.func, ast.Attribute)
+        and isinstance(call.func.value, ast.Name)
+        and call.func.value.id == "self"
+    )
+
+def _param_value(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        # codegen writes $...$ values back verbatim, so expressions survive a round trip
+        return f"${ast.unparse(node)}$"
+
+def _params(call):
+    params = {}
+    for i, arg in enumerate(call.args):
+        params[f"arg{i}"] = _param_value(arg)
+    for kw in call.keywords:
+        if kw.arg is not None:
+            params[kw.arg] = _param_value(kw.value)
+    return params
+
+def _target_name(target):
+    if isinstance(target, ast.Name):
+        return target.id
+    if isinstance(target, ast.Attribute):
+        return target.attr
+    if isinstance(target, ast.Subscript):
+        return _target_name(target.value)
+    if isinstance(target, ast.Starred):
+        return _target_name(target.value)
+    return None
+
+def _assignments(node):
+    if isinstance(node, ast.Assign):
+        target, value = node.targets[-1], node.value
+    else:
+        target, value = node.target, node.value
+    if isinstance(target, (ast.Tuple, ast.List)) and isinstance(value, (ast.Tuple, ast.List)) \
+            and len(target.elts) == len(value.elts):
+        return list(zip(map(_target_name, target.elts), value.elts))
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return [(None, value)]
+    return [(_target_name(target), value)]
+
+def _element(call, var_name, line_offset, col_offset):
+    span = (
+        call.lineno + line_offset, call.col_offset + col_offset,
+        call.end_lineno + line_offset, call.end_col_offset + col_offset,
+    )
+    return SceneElement(_base_name(call.func) or "Unknown", var_name, _params(call), span)
+
+def index_statements(statements, line_offset=0, col_offset=0):
+    elements = []
+    stack = list(reversed(statements))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            for var_name, value in _assignments(node):
+                if isinstance(value, ast.Call):
+                    elements.append(_element(value, var_name, line_offset, col_offset))
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            call = node.value
+            if _is_self_method(call):
+                # self.play(Create(x), FadeIn(y)) lists its animations as the elements
+                for arg in call.args:
+                    if isinstance(arg, ast.Call):
+                        elements.append(_element(arg, None, line_offset, col_offset))
+            elif _base_name(call.func):
+                elements.append(_element(call, None, line_offset, col_offset))
+        # pushed last-to-first so the stack pops statements in source order
+        children = []
+        for field in ("body", "handlers", "cases", "orelse", "finalbody"):
+            for child in getattr(node, field, None) or ():
+                if isinstance(child, ast.stmt):
+                    children.append(child)
+                elif hasattr(child, "body"):
+                    children.extend(child.body)
+        stack.extend(reversed(children))
+    return elements
+
+def find_scene_body(tree):
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and any(_base_name(b).endswith("Scene") for b in node.bases):
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name == "construct" and item.body:
+                    return item.body
+            return node.body
+    return []
+
+class Block:
+    __slots__ = ("start", "end", "elements")
+
+    def __init__(self, start, end, elements):
+        self.start = start
+        self.end = end
+        self.elements = elements
+
+    def shift(self, delta):
+        self.start += delta
+        self.end += delta
+        for element in self.elements:
+            a, b, c, d = element.span
+            element.span = (a + delta, b, c + delta, d)
+
+class SceneIndex:
+    def __init__(self):
+        self.source = None
+        self.lines = []
+        self.blocks = []
+        self.indent = ""
+        self.wrapped = False
+
+    def elements(self):
+        return [element for block in self.blocks for element in block.elements]
+
+    def _blocks(self, statements, line_offset=0, col_offset=0):
+        return [
+            Block(node.lineno + line_offset, node.end_lineno + line_offset,
+                  index_statements([node], line_offset, col_offset))
+            for node in statements
+        ]
+
+    def parse(self, source):
+        lines = source.splitlines()
+        wrapped = not ("class " in source and "Scene" in source)
+        text = WRAPPER + textwrap.indent(source, "    ") if wrapped else source
+        tree = ast.parse(text)
+        # spans always refer to the caller's text, not the synthetic wrapper
+        line_offset, col_offset = (-1, -4) if wrapped else (0, 0)
+        body = find_scene_body(tree)
+        self.source, self.lines, self.wrapped = source, lines, wrapped
+        self.blocks = self._blocks(body, line_offset, col_offset)
+        self.indent = " " * (body[0].col_offset + col_offset) if body else ""
+        return self.elements()
+
+    def update(self, source):
+        if self.source is None or self.wrapped or not self.blocks:
+            return self.parse(source)
+        if source == self.source:
+            return self.elements()
+        blocks = self._reparse(source)
+        if blocks is None:
+            return self.parse(source)
+        return self.elements()
+
+    def _reparse(self, source):
+        old, new = self.lines, source.splitlines()
+        limit = min(len(old), len(new))
+        prefix = 0
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+        # 1-based inclusive range of old lines touched by the edit; empty for pure insertions
+        first_changed, last_changed = prefix + 1, len(old) - suffix
+        lo = max(first_changed - 1, 1) if first_changed > last_changed else first_changed
+        hi = max(last_changed, lo)
+        if lo < self.blocks[0].start or hi > self.blocks[-1].end:
+            return None
+        touched = [i for i, b in enumerate(self.blocks) if b.end >= lo and b.start <= hi]
+        if not touched:
+            return None
+        i, j = touched[0], touched[-1]
+        start, end = min(self.blocks[i].start, lo), max(self.blocks[j].end, hi)
+        delta = len(new) - len(old)
+        region = new[start - 1:end + delta]
+        if any(line.strip() and not line.startswith(self.indent) for line in region):
+            return None
+        try:
+            tree = ast.parse("\n".join(line[len(self.indent):] for line in region))
+        except SyntaxError:
+            return None
+        replaced = self._blocks(tree.body, start - 1, len(self.indent))
+        for block in self.blocks[j + 1:]:
+            block.shift(delta)
+        self.blocks[i:j + 1] = replaced
+        self.source, self.lines = source, new
+        return replaced
@@ -0,0 +1,122 @@
+import itertools
+
+from core.codegen import split_display_name, var_name_for
+
+class Element:
+    __slots__ = ("uid", "var_name", "cls_name", "props", "cls", "schema", "span", "problem")
+
+    def __init__(self, uid, var_name, cls_name, props=None, cls=None, span=None, schema=None):
+        self.uid = uid
+        self.var_name = var_name
+        self.cls_name = cls_name
+        self.schema = schema
+        self.props = {} if props is None else schema.normalize(props) if schema else props
+        self.cls = cls
+        self.span = span
+        self.problem = None
+
+    @property
+    def name(self):
+        return f"{self.var_name} ({self.cls_name})"
+
+class SceneModel:
+    def __init__(self, first_uid=1):
+        self.elements = []
+        self._by_uid = {}
+        self._vars = set()
+        self._var_counts = {}
+        self._rows = None
+        self._uids = itertools.count(first_uid)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __getitem__(self, row):
+        return self.elements[row]
+
+    def get(self, uid):
+        return self._by_uid.get(uid)
+
+    def row(self, uid):
+        if self._rows is None:
+            self._rows = {e.uid: i for i, e in enumerate(self.elements)}
+        return self._rows.get(uid)
+
+    def next_uid(self):
+        return next(self._uids)
+
+    def create(self, name, props=None, cls=None, uid=None, span=None, schema=None):
+        var_name, cls_name = split_display_name(name)
+        return Element(uid or self.next_uid(), var_name, cls_name, props, cls, span, schema)
+
+    def unique_var(self, base):
+        # counters remember where each base left off, so repeated adds stay O(1)
+        count = self._var_counts.get(base, 1)
+        candidate = base if count == 1 else f"{base}{count}"
+        while candidate in self._vars:
+            count += 1
+            candidate = f"{base}{count}"
+        self._var_counts[base] = count
+        return candidate
+
+    def _index(self, element):
+        self._by_uid[element.uid] = element
+        self._vars.add(element.var_name)
+
+    def _unindex(self, element):
+        self._by_uid.pop(element.uid, None)
+        self._vars.discard(element.var_name)
+
+    def insert(self, element, row=None):
+        if row is None or row >= len(self.elements):
+            self.elements.append(element)
+            if self._rows is not None:
+                self._rows[element.uid] = len(self.elements) - 1
+        else:
+            self.elements.insert(row, element)
+            self._rows = None
+        self._index(element)
+        return element
+
+    def extend(self, elements):
+        start = len(self.elements)
+        self.elements.extend(elements)
+        for i, element in enumerate(elements):
+            self._index(element)
+            if self._rows is not None:
+                self._rows[element.uid] = start + i
+
+    def remove(self, uid):
+        row = self.row(uid)
+        if row is None:
+            return None
+        element = self.elements.pop(row)
+        self._unindex(element)
+        self._rows = None if row < len(self.elements) else self._rows
+        if self._rows is not None:
+            self._rows.pop(uid, None)
+        return element
+
+    def set_props(self, uid, props):
+        element = self._by_uid.get(uid)
+        if element is not None:
+            element.props = element.schema.normalize(props) if element.schema else props
+        return element
+
+    def reset(self, elements=()):
+        self.elements = list(elements)
+        self._by_uid.clear()
+        self._vars.clear()
+        self._var_counts.clear()
+        self._rows = None
+        for element in self.elements:
+            self._index(element)
+
+    def code_elements(self, catalog):
+        return [
+            (e.uid, e.cls_name, var_name_for(e.var_name), catalog.is_animation(e.cls_name), e.props, e.schema)
+            for e in self.elements if e.cls_name in catalog
+        ]
@@ -0,0 +1,193 @@
+import ast
+import re
+
+MISSING = object()
+
+CONSTANT = re.compile(r"^[A-Z_][A-Z0-9_]*$")
+HEX_COLOR = re.compile(r"^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$")
+TYPE_TOKEN = re.compile(r"[A-Za-z_][A-Za-z0-9_.]*")
+WRAPPER_TOKENS = {"None", "NoneType", "Optional", "Union", "typing.Optional", "typing.Union"}
+
+# slider bounds are picked from the last word of the parameter name
+POSITIVE_WORDS = {"radius", "width", "height", "size", "length", "time", "scale", "buff", "ratio"}
+UNBOUNDED_WORDS = {"shift", "point", "start", "end", "angle", "x", "y", "z"}
+
+def is_marked(value, mark):
+    return len(value) >= 2 and value.startswith(mark) and value.endswith(mark)
+
+def coerce_int(text):
+    try:
+        return int(text)
+    except ValueError:
+        value = float(text)
+        if not value.is_integer():
+            raise ValueError(f"expected a whole number, got {text!r}")
+        return int(value)
+
+def coerce_float(text):
+    return float(text)
+
+def coerce_bool(text):
+    lowered = text.lower()
+    if lowered in ("true", "1", "yes", "on"):
+        return True
+    if lowered in ("false", "0", "no", "off"):
+        return False
+    raise ValueError(f"expected True or False, got {text!r}")
+
+def coerce_color(text):
+    if HEX_COLOR.match(text) or CONSTANT.match(text):
+        return text
+    raise ValueError(f"expected a #hex colour or a colour constant, got {text!r}")
+
+def coerce_text(text):
+    return text
+
+def coerce_expr(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        pass
+    compile(text, "<property>", "eval")
+    # anything that is not a literal is written back verbatim, same as a $...$ value typed by hand
+    return f"${text}$"
+
+def emit_color(value):
+    if isinstance(value, str) and CONSTANT.match(value):
+        return value
+    return repr(value)
+
+COERCERS = {
+    "int": coerce_int,
+    "float": coerce_float,
+    "bool": coerce_bool,
+    "color": coerce_color,
+    "text": coerce_text,
+    "expr": coerce_expr,
+}
+
+def param_kind(name, spec):
+    default = spec.get("default", "")
+    if spec.get("color"):
+        return "color"
+    tokens = set(TYPE_TOKEN.findall(spec.get("type", "str"))) - WRAPPER_TOKENS
+    if isinstance(default, bool) or tokens == {"bool"}:
+        return "bool"
+    numeric = isinstance(default, (int, float)) or (tokens and tokens <= {"int", "float"})
+    if numeric and not spec.get("repr"):
+        return "float" if isinstance(default, float) or "float" in tokens else "int"
+    if spec.get("repr"):
+        return "expr"
+    # plain (or Optional) str is text; a str default only counts when the annotation allows str at all
+    if tokens == {"str"} or (isinstance(default, str) and default != "" and "str" in tokens):
+        return "text"
+    return "expr"
+
+def slider_range(name, kind, default):
+    if kind not in ("int", "float"):
+        return None
+    span = max(10, abs(default) * 4) if isinstance(default, (int, float)) else 10
+    word = name.rsplit("_", 1)[-1]
+    if word in ("opacity", "alpha"):
+        low, high = 0, 1
+    elif word in POSITIVE_WORDS:
+        low, high = 0, span
+    elif word in UNBOUNDED_WORDS:
+        low, high = -100, 100
+    else:
+        low, high = -span, span
+    step = 1 if kind == "int" else 0.01
+    return low, high, step
+
+class ParamSchema:
+    __slots__ = ("name", "kind", "default", "default_text", "optional", "slider", "_coerce", "_emit")
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.kind = param_kind(name, spec)
+        default = spec.get("default", "")
+        if default == "" and self.kind != "text":
+            default = MISSING
+        self.default = default
+        self.default_text = self.display(default)
+        # inherited kwargs and defaults that cannot be written as code are only emitted once changed
+        self.optional = bool(spec.get("inherited") or spec.get("repr"))
+        self.slider = slider_range(name, self.kind, default)
+        self._coerce = COERCERS[self.kind]
+        self._emit = emit_color if self.kind == "color" else repr
+
+    def display(self, value):
+        if value is MISSING:
+            return ""
+        if self.kind == "color":
+            if isinstance(value, str) and (HEX_COLOR.match(value) or CONSTANT.match(value) or is_marked(value, "$")):
+                return value
+            return ""
+        return value if isinstance(value, str) else str(value)
+
+    def coerce(self, text):
+        # raises ValueError for text this parameter cannot take
+        if is_marked(text, "!"):
+            return text
+        if is_marked(text, "$"):
+            compile(text[1:-1], "<property>", "eval")
+            return text
+        if self.kind == "text":
+            return text
+        text = text.strip()
+        if text == "None":
+            return None
+        if not text:
+            return MISSING
+        return self._coerce(text)
+
+    def parse(self, text):
+        try:
+            return self.coerce(text), None
+        except SyntaxError as e:
+            return MISSING, f"{self.name}: invalid expression ({e.msg})"
+        except ValueError as e:
+            return MISSING, f"{self.name}: {e}"
+
+    def normalize(self, value):
+        if not isinstance(value, str) or self.kind == "text":
+            return value
+        typed, error = self.parse(value)
+        return value if error or typed is MISSING else typed
+
+    def emit(self, value):
+        if isinstance(value, str) and self.kind != "text" and not is_marked(value, "!") and not is_marked(value, "$"):
+            # hand-edited or legacy string values still get written with the parameter's type
+            typed, error = self.parse(value)
+            if error or typed is MISSING:
+                return repr(value)
+            value = typed
+        if isinstance(value, str):
+            if is_marked(value, "!"):
+                return None
+            if is_marked(value, "$"):
+                return value[1:-1]
+        return self._emit(value)
+
+class ClassSchema:
+    __slots__ = ("name", "params")
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = {key: ParamSchema(key, spec) for key, spec in params.items()}
+
+    def __iter__(self):
+        return iter(self.params.values())
+
+    def __len__(self):
+        return len(self.params)
+
+    def get(self, key):
+        return self.params.get(key)
+
+    def normalize(self, props):
+        out = {}
+        for key, value in props.items():
+            param = self.params.get(key)
+            out[key] = value if param is None else param.normalize(value)
+        return out
@@ -0,0 +1,87 @@
+import bisect
+import re
+from collections import defaultdict
+
+WORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+EXACT, PREFIX, INITIALS, SUBSTRING, FUZZY = range(5)
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def initials(name):
+    return "".join(word[0] for word in WORD_RE.findall(name)).lower()
+
+class SearchIndex:
+    def __init__(self, names=()):
+        self.names = []
+        self._lower = []
+        self._sorted = []
+        self._by_initials = defaultdict(set)
+        self._by_trigram = defaultdict(set)
+        self.add(names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, names):
+        for name in names:
+            idx = len(self.names)
+            low = name.lower()
+            self.names.append(name)
+            self._lower.append(low)
+            bisect.insort(self._sorted, (low, idx))
+            caps = initials(name)
+            for i in range(1, len(caps) + 1):
+                self._by_initials[caps[:i]].add(idx)
+            for gram in trigrams(low):
+                self._by_trigram[gram].add(idx)
+
+    def _prefix_ids(self, q):
+        start = bisect.bisect_left(self._sorted, (q, -1))
+        ids = []
+        for low, idx in self._sorted[start:]:
+            if not low.startswith(q):
+                break
+            ids.append(idx)
+        return ids
+
+    def _substring_ids(self, q):
+        if len(q) < 3:
+            return [i for i, low in enumerate(self._lower) if q in low]
+        sets = sorted((self._by_trigram.get(g, ()) for g in trigrams(q)), key=len)
+        if not sets or not sets[0]:
+            return []
+        candidates = set(sets[0]).intersection(*sets[1:])
+        return [i for i in candidates if q in self._lower[i]]
+
+    def _fuzzy_ids(self, q):
+        pattern = re.compile(".*?".join(map(re.escape, q)))
+        return [i for i, low in enumerate(self._lower) if pattern.search(low)]
+
+    def rank(self, text):
+        q = text.strip().lower()
+        if not q:
+            return None
+        ranks = {}
+
+        def put(ids, tier):
+            for i in ids:
+                name = self.names[i]
+                if name not in ranks:
+                    ranks[name] = (tier, len(name), self._lower[i])
+
+        put(self._prefix_ids(q), PREFIX)
+        put(self._by_initials.get(q, ()), INITIALS)
+        put(self._substring_ids(q), SUBSTRING)
+        put(self._fuzzy_ids(q), FUZZY)
+        for name, (tier, length, low) in list(ranks.items()):
+            if low == q:
+                ranks[name] = (EXACT, length, low)
+        return ranks
+
+    def search(self, text, limit=None):
+        ranks = self.rank(text)
+        if ranks is None:
+            return sorted(self.names, key=str.lower)[:limit]
+        return sorted(ranks, key=ranks.__getitem__)[:limit]
@@ -0,0 +1,134 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from core.cache import cache_dir
+
+SEGMENT_CALLS = ("play", "wait")
+# updaters advance by dt, so replaying or skipping earlier animations leaves them in a different state
+UPDATER_NAMES = {
+    "add_updater", "always_redraw", "always", "f_always", "always_shift", "always_rotate",
+    "ValueTracker", "ComplexValueTracker", "turn_animation_into_updater", "cycle_animation",
+}
+CONFIG_KEYS = (
+    "pixel_width", "pixel_height", "frame_rate", "background_color", "background_opacity",
+    "renderer", "transparent", "movie_file_extension", "format", "zero_pad",
+)
+
+def _is_segment_call(node):
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr in SEGMENT_CALLS
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "self"
+    )
+
+def _has_segment_call(node):
+    return any(_is_segment_call(n) for n in ast.walk(node))
+
+def uses_updaters(source):
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return False
+    for node in ast.walk(tree):
+        name = node.id if isinstance(node, ast.Name) else node.attr if isinstance(node, ast.Attribute) else None
+        if name in UPDATER_NAMES:
+            return True
+    return False
+
+def find_construct(tree, scene_name=None):
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if scene_name and node.name != scene_name:
+            continue
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == "construct":
+                return node, item
+    return None, None
+
+def segment_keys(source, render_config, scene_name=None):
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    scene, construct = find_construct(tree, scene_name)
+    if construct is None:
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(render_config, sort_keys=True, default=str).encode())
+    for node in tree.body:
+        if node is not scene:
+            digest.update(ast.dump(node).encode())
+    for item in scene.body:
+        if item is construct:
+            continue
+        if _has_segment_call(item):
+            return None
+        digest.update(ast.dump(item).encode())
+
+    keys = []
+    for stmt in construct.body:
+        digest.update(ast.dump(stmt).encode())
+        if isinstance(stmt, ast.Expr) and _is_segment_call(stmt.value):
+            keys.append(digest.copy().hexdigest())
+        elif _has_segment_call(stmt):
+            # loops and branches make the play sequence data dependent
+            return None
+    return keys
+
+def render_config_key(config, version):
+    key = {k: config[k] for k in CONFIG_KEYS if k in config}
+    key["manim"] = version
+    return key
+
+class SegmentCache:
+    def __init__(self, root=None, max_bytes=4 * 1024 ** 3):
+        self.root = Path(root) if root else cache_dir("segments")
+        self.max_bytes = max_bytes
+
+    def path_for(self, key, suffix=".mp4"):
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def get(self, key, suffix=".mp4"):
+        path = self.path_for(key, suffix)
+        if not path.exists():
+            return None
+        os.utime(path)
+        return path
+
+    def put(self, key, src):
+        src = Path(src)
+        dst = self.path_for(key, src.suffix)
+        if dst.exists():
+            return dst
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+        return dst
+
+    def prune(self):
+        files = []
+        total = 0
+        for path in self.root.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            st = path.stat()
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                continue
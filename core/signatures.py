@@ -0,0 +1,59 @@
+import inspect
+from functools import lru_cache
+
+def annotation_name(annotation):
+    if annotation is inspect.Parameter.empty:
+        return "str"
+    if isinstance(annotation, str):
+        return annotation
+    return annotation.__name__ if hasattr(annotation, "__name__") else str(annotation)
+
+def is_color_param(name, type_name):
+    if name == "color" or name.endswith("_color"):
+        return True
+    return "color" in type_name.lower() and not name.endswith("s")
+
+def _own_init_params(klass):
+    init = klass.__dict__.get("__init__")
+    if init is None:
+        return None
+    if not inspect.isfunction(init):
+        return []
+    try:
+        sig = inspect.signature(init)
+    except (TypeError, ValueError):
+        return []
+    return list(sig.parameters.values())[1:]
+
+@lru_cache(maxsize=None)
+def resolve_params(cls):
+    params = {}
+    primary = None
+    for klass in inspect.getmro(cls):
+        if klass is object:
+            break
+        own = _own_init_params(klass)
+        if own is None:
+            continue
+        if primary is None:
+            primary = klass
+        forwards_kwargs = False
+        for param in own:
+            if param.kind is param.VAR_KEYWORD:
+                forwards_kwargs = True
+                continue
+            if param.kind is param.VAR_POSITIONAL or param.name in params:
+                continue
+            if klass is not primary and param.kind is param.POSITIONAL_ONLY:
+                continue
+            type_name = annotation_name(param.annotation)
+            params[param.name] = {
+                "type": type_name,
+                "default": param.default if param.default is not inspect.Parameter.empty else "",
+                "color": is_color_param(param.name, type_name),
+                "owner": klass.__name__,
+                "inherited": klass is not primary,
+            }
+        if not forwards_kwargs:
+            break
+    return params
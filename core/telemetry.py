@@ -0,0 +1,93 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+from core.cache import atomic_write_text, cache_dir
+
+class Telemetry:
+    def __init__(self, emit):
+        self.emit = emit
+        self.origin = time.perf_counter()
+
+    def span(self, name, start, end, **args):
+        self.emit({
+            "event": "span",
+            "name": name,
+            "start": start - self.origin,
+            "duration": end - start,
+            "args": args,
+        })
+
+    @contextmanager
+    def measure(self, name, **args):
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.span(name, start, time.perf_counter(), **args)
+
+def caller_line(filename, depth=2):
+    frame = sys._getframe(depth)
+    while frame is not None:
+        if frame.f_code.co_filename == filename:
+            return frame.f_lineno
+        frame = frame.f_back
+    return None
+
+def to_chrome_trace(spans, process_name="manim render"):
+    events = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": process_name}}]
+    for span in spans:
+        label = span["name"]
+        if span["args"].get("line"):
+            label = f"{label} (line {span['args']['line']})"
+        events.append({
+            "name": label,
+            "cat": span["name"],
+            "ph": "X",
+            "ts": round(span["start"] * 1e6),
+            "dur": round(span["duration"] * 1e6),
+            "pid": 1,
+            "tid": span["args"].get("worker", 1),
+            "args": span["args"],
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+class TelemetryHistory:
+    def __init__(self, path=None, keep=200):
+        self.path = path or cache_dir("telemetry") / "runs.jsonl"
+        self.keep = keep
+        self._runs = None
+        self._lines = 0
+
+    def load(self):
+        if self._runs is None:
+            runs = []
+            if self.path.exists():
+                for line in self.path.read_text(encoding="utf-8").splitlines():
+                    try:
+                        runs.append(json.loads(line))
+                    except ValueError:
+                        continue
+                    self._lines += 1
+            self._runs = runs[-self.keep:]
+        return self._runs
+
+    def append(self, run):
+        runs = self.load()
+        runs.append(run)
+        del runs[:-self.keep]
+        # appends are one line; the file is only rewritten once it holds twice what is kept
+        if self._lines + 1 > 2 * self.keep:
+            atomic_write_text(self.path, "".join(json.dumps(r) + "\n" for r in runs))
+            self._lines = len(runs)
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+        self._lines += 1
+
+    def previous(self, kind, before=None):
+        for run in reversed(self.load()):
+            if run.get("kind") == kind and run.get("time") != before:
+                return run
+        return None
@@ -0,0 +1,114 @@
+import json
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.cache import atomic_write_text, cache_dir
+from core.catalog import manim_fingerprint
+from core.parallel_render import default_workers
+
+THUMB_SIZE = (128, 72)
+
+def render_thumbnail(module, qualname, path, size=THUMB_SIZE):
+    import importlib
+
+    from manim import config, tempconfig
+    from manim.camera.camera import Camera
+
+    cls = importlib.import_module(module)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    width, height = size
+    with tempconfig({"pixel_width": width, "pixel_height": height, "background_color": "#1E1E1E"}):
+        mob = cls()
+        # leave a margin so strokes at the edge are not clipped
+        if mob.width > config.frame_width * 0.8:
+            mob.scale_to_fit_width(config.frame_width * 0.8)
+        if mob.height > config.frame_height * 0.8:
+            mob.scale_to_fit_height(config.frame_height * 0.8)
+        mob.move_to([0, 0, 0])
+        camera = Camera()
+        camera.capture_mobject(mob)
+        tmp = f"{path}.{os.getpid()}.tmp.png"
+        camera.get_image().save(tmp)
+    os.replace(tmp, path)
+    return path
+
+class ThumbnailStore:
+    def __init__(self, version=None, size=THUMB_SIZE, workers=None):
+        if version is None:
+            fingerprint = manim_fingerprint()
+            version = fingerprint["version"] if fingerprint else "unknown"
+        self.size = size
+        self.dir = cache_dir("thumbnails", f"manim-{version}", f"{size[0]}x{size[1]}")
+        self.failures_path = self.dir / "failures.json"
+        self.failures = self._load_failures()
+        self.workers = workers or min(4, default_workers())
+        self._pool = None
+        self._pending = set()
+        self._results = queue.SimpleQueue()
+
+    def _load_failures(self):
+        try:
+            return json.loads(self.failures_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def path(self, name):
+        return self.dir / f"{name}.png"
+
+    def cached(self, name):
+        path = self.path(name)
+        return path if path.exists() else None
+
+    def request(self, entry):
+        name = entry["name"]
+        if name in self._pending or name in self.failures or self.cached(name):
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending.add(name)
+        try:
+            future = self._pool.submit(render_thumbnail, entry["module"], entry["qualname"], str(self.path(name)), self.size)
+        except (BrokenProcessPool, RuntimeError):
+            self._reset()
+            return
+        future.add_done_callback(lambda f, n=name: self._results.put((n, f)))
+
+    def _reset(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._pending.clear()
+
+    def drain(self):
+        done = []
+        failed = False
+        while True:
+            try:
+                name, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(name)
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is None:
+                done.append((name, self.path(name)))
+            elif isinstance(error, BrokenProcessPool):
+                # a crashed worker takes every queued class down with it; those get retried later
+                self._reset()
+            else:
+                self.failures[name] = f"{type(error).__name__}: {error}"
+                failed = True
+                done.append((name, None))
+        if failed:
+            atomic_write_text(self.failures_path, json.dumps(self.failures, indent=1, sort_keys=True))
+        return done
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
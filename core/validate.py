@@ -0,0 +1,60 @@
+import time
+import traceback
+from pathlib import Path
+
+def describe_failure(exc, script):
+    script = str(script)
+    line = None
+    if isinstance(exc, SyntaxError) and exc.filename == script:
+        line = exc.lineno
+    else:
+        # the deepest frame inside the scene file is the line the user can actually fix
+        for frame in traceback.extract_tb(exc.__traceback__):
+            if frame.filename == script:
+                line = frame.lineno
+    message = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+    return {"line": line, "message": message, "traceback": "".join(traceback.format_exception(exc))}
+
+def run_validate(job, emit):
+    from manim import tempconfig
+
+    from core.render_daemon import load_scene_class
+
+    workdir = Path(job["workdir"])
+    workdir.mkdir(parents=True, exist_ok=True)
+    module_name = job.get("module", "validate_scene")
+    script = workdir / f"{module_name}.py"
+    script.write_text(job["source"], encoding="utf-8")
+    overrides = {
+        "input_file": str(script),
+        "media_dir": str(workdir / "media"),
+        "dry_run": True,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+        "progress_bar": "none",
+    }
+    started = time.perf_counter()
+    problems = []
+    length = [0.0]
+    try:
+        with tempconfig(overrides):
+            scene = load_scene_class(script, module_name, job.get("scene"))()
+            # every play still builds and finishes its animations, it just never draws a frame
+            scene.renderer._original_skipping_status = True
+            scene.renderer.skip_animations = True
+            scene.add_sound = lambda *args, **kwargs: None
+            play = scene.play
+
+            def timed_play(*args, **kwargs):
+                # skipped plays never advance the renderer clock, so the scene length is summed here
+                result = play(*args, **kwargs)
+                length[0] += scene.duration
+                return result
+
+            scene.play = timed_play
+            scene.render()
+    except Exception as e:
+        problems.append(describe_failure(e, script))
+    emit({"event": "done", "output": "", "problems": problems, "length": None if problems else length[0],
+          "elapsed": time.perf_counter() - started})
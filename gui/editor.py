@@ -1,213 +1,218 @@
-import inspect
-import re
 import sys
 import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(current_dir)
 import json
-import subprocess
 from pathlib import Path
 from dotenv import load_dotenv
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
-from PySide6.QtGui import QAction, QColor, QFont, QFontDatabase
+from PySide6.QtCore import Qt, QThread, Signal, QSize, QTimer, QUrl
+from PySide6.QtGui import QAction, QDesktopServices, QFont, QFontDatabase, QTextCursor
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QDockWidget, QListWidget, QListWidgetItem,
-    QTreeWidget, QTreeWidgetItem, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QFileDialog, QPlainTextEdit, QLineEdit, QTableWidget, QTableWidgetItem,
-    QHeaderView, QSlider, QMessageBox, QColorDialog, QSpinBox, QMenu
+    QApplication, QMainWindow, QWidget, QDockWidget, QListView,
+    QTreeView, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QFileDialog, QPlainTextEdit, QLineEdit, QMessageBox, QSpinBox, QMenu, QListWidget
 )
-from manim import *
 
 sys.path.append(str(Path(__file__).parent.parent))
-from core.elements import get_exposed_classes, get_class_init_params, class_in_manim_animations
-
-from google import genai
-from google.genai import types
+from core.ai import Cancelled, ResponseCache, default_backend, generate, strip_fences
+from core.cache import atomic_write_text
+from core.catalog import ClassCatalog, iter_catalog
+from core.codegen import CodeModel, scene_frame, split_display_name, var_name_for
+from core.history import History, make_record
+from core.parallel_render import default_workers
+from core.logs import LogBuffer
+from core.project_store import ProjectStore
+from core.quality import ladder_rank, quality_ladder
+from core.render_daemon import RenderDaemon
+from core.scene_model import SceneModel
+from core.scene_index import SceneIndex
+from core.search import SearchIndex
+from core.telemetry import TelemetryHistory
+from core.thumbnails import THUMB_SIZE, ThumbnailStore
+from gui.hot_reload import HotReloader
+from gui.logs import LogView
+from gui.models import ElementsListModel, RankedFilterProxy, SceneItemModel
+from gui.playback import PlaybackPanel
+from gui.preview import PreviewPanel
+from gui.properties import PropertiesTable
+from gui.profiler import ProfilerPanel
+from gui.scheduler import RenderScheduler
+from gui.validation import Validator, source_key
+from gui.waveform import SoundTrack
 
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-client = genai.Client(api_key=GEMINI_API_KEY) if GEMINI_API_KEY else None
 
-class ProcThread(QThread):
-    line = Signal(str)
-    def __init__(self, cmd):
-        super().__init__()
-        self.cmd = cmd
+HOT_RELOAD_LABEL = "Hot reload"
+LADDER_GROUP = "preview-ladder"
+
+class CatalogThread(QThread):
+    batch = Signal(list)
+    log = Signal(str)
+
     def run(self):
-        p = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        for ln in p.stdout:
-            self.line.emit(ln.rstrip())
-            
+        try:
+            for entries in iter_catalog():
+                self.batch.emit(entries)
+        except Exception as e:
+            self.log.emit(f"Failed to load element catalog: {e}")
+
+class DebouncedWriter(QTimer):
+    def __init__(self, path, interval=400, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._text = None
+        self._written = None
+        self.setSingleShot(True)
+        self.setInterval(interval)
+        self.timeout.connect(self.flush)
+
+    def owns(self, text):
+        # the file watcher can see a write that an even newer edit has already superseded
+        return text in (self._written, self._text)
+
+    def schedule(self, text):
+        self._text = text
+        self.start()
+
+    def flush(self):
+        self.stop()
+        if self._text is None:
+            return
+        text, self._text = self._text, None
+        atomic_write_text(self.path, text)
+        self._written = text
+
 class AIThread(QThread):
+    chunk = Signal(str)
     finished = Signal(str)
+    cancelled = Signal()
     log = Signal(str)
 
-    def __init__(self, prompt):
+    def __init__(self, prompt, backend, cache):
         super().__init__()
         self.prompt = prompt
+        self.backend = backend
+        self.cache = cache
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
 
     def run(self):
         try:
             self.log.emit(f"Generating AI code for: {self.prompt}")
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                config=types.GenerateContentConfig(
-                    system_instruction=(
-                        "You are a code generation bot. Only output working Python Manim code, "
-                        "no explanations or extra text. Generate complete, functional, properly formatted Python code."
-                    )
-                ),
-                contents=self.prompt
-            ).text
-            code = re.sub(r'^```[\w]*\s*', '', response)
-            code = re.sub(r'\s*```$', '', code).strip()
-            self.finished.emit(code)
+            text, cached = generate(
+                self.prompt, self.backend, self.cache,
+                on_chunk=self.chunk.emit, cancelled=lambda: self._cancelled,
+            )
+            if cached:
+                self.log.emit("Reused cached response for this prompt")
+            self.finished.emit(strip_fences(text))
+        except Cancelled:
+            self.log.emit("AI generation cancelled")
+            self.cancelled.emit()
         except Exception as e:
             self.log.emit(f"AI generation failed: {e}")
             self.finished.emit("")
-class PropertiesTable(QTableWidget):
-    valueChanged = Signal(dict)
-    def __init__(self, parent=None):
-        super().__init__(0, 2, parent)
-        self.setHorizontalHeaderLabels(["Property", "Value"])
-        self.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.verticalHeader().setVisible(False)
-        self.setAlternatingRowColors(True)
-        self._widgets = {}
-        self._meta = {}
-        self._color_btn = None
-
-    def clear_props(self):
-        self.setRowCount(0)
-        self._widgets.clear()
-        self._meta.clear()
-        self._color_btn = None
-
-    def _add_row(self, key, widget):
-        r = self.rowCount()
-        self.insertRow(r)
-        self.setItem(r, 0, QTableWidgetItem(key))
-        self.setCellWidget(r, 1, widget)
-        self._widgets[key] = widget
-        
-    def _focused_lineedit(self):
-        w = QApplication.focusWidget()
-        return w if isinstance(w, QLineEdit) else None
-
-    def surround_with_dollars(self):
-        e = self._focused_lineedit()
-        if e:
-            txt = e.text()
-            if not (txt.startswith("$") and txt.endswith("$")):
-                e.setText(f"${txt}$")
-            self.emit_values()
-
-    def surround_with_exclaim(self):
-        e = self._focused_lineedit()
-        if e:
-            txt = e.text()
-            if not (txt.startswith("!") and txt.endswith("!")):
-                e.setText(f"!{txt}!")
-            self.emit_values()
-            
-    def show_properties(self, cls, params=None):
-        self.clear_props()
-        if not cls:
-            return
-        if params is None:
-            params = {}
-
-        sig = inspect.signature(cls.__init__)
-        for name, param in sig.parameters.items():
-            if name == "self":
-                continue
-            val = params.get(name, getattr(param, "default", ""))
-            if val is inspect.Parameter.empty:
-                val = ""
-            if isinstance(val, (int, float)):
-                wrap = QWidget()
-                lay = QHBoxLayout(wrap)
-                lay.setContentsMargins(0, 0, 0, 0)
-                lay.setSpacing(4)
-                slider = QSlider(Qt.Horizontal)
-                slider.setMinimum(-10000)
-                slider.setMaximum(10000)
-                slider.setValue(int(float(val) * 100))
-                entry = QLineEdit(str(val))
-                entry.setMaximumWidth(80)
-                slider.valueChanged.connect(lambda v, e=entry: e.setText(str(round(v / 100, 2))))
-                entry.editingFinished.connect(lambda s=entry, sl=slider: sl.setValue(int(float(s.text()) * 100)))
-                lay.addWidget(slider)
-                lay.addWidget(entry)
-                self._add_row(name, wrap)
-            elif isinstance(val, str):
-                le = QLineEdit(val)
-                le.setMinimumHeight(28)
-                self._add_row(name, le)
-            elif isinstance(val, QColor):
-                self.add_color_picker(val.name())
-            else:
-                self._add_row(name, QLineEdit(repr(val)))
-
-    def add_color_picker(self, existing_hex=None):
-        btn = QPushButton(existing_hex or "Pick color")
-        btn.setMinimumHeight(28)
-        btn.setStyleSheet(f"background:{existing_hex or '#FFFFFF'};")
-        def pick():
-            col = QColorDialog.getColor()
-            if col.isValid():
-                btn.setText(col.name())
-                btn.setStyleSheet(f"background:{col.name()};")
-                self.emit_values()
-        btn.clicked.connect(pick)
-        self._add_row("color", btn)
-        self._color_btn = btn
-
-    def values(self):
-        out = {}
-        for key, w in self._widgets.items():
-            if isinstance(w, QWidget) and isinstance(w.layout(), QHBoxLayout):
-                e = w.layout().itemAt(1).widget()
-                out[key] = e.text()
-            elif isinstance(w, QLineEdit):
-                out[key] = w.text()
-            elif isinstance(w, QPushButton):
-                t = w.text()
-                if t.lower() != "pick color":
-                    out[key] = t
-        return out
-
-    def emit_values(self):
-        self.valueChanged.emit(self.values())
 
 class EditorWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Editor | Magical Manim")
         self.resize(1500, 950)
-        self.props_path = Path("props.json")
-        self.props_data = {}
-        if self.props_path.exists():
-            try:
-                self.props_data = json.loads(self.props_path.read_text(encoding="utf-8"))
-            except:
-                self.props_data = {}
+        self.project = ProjectStore("project.db")
+        self.scene = SceneModel(first_uid=self.project.max_uid() + 1)
+        self.scene_model = SceneItemModel(self.scene, self)
+        self._project_batches = None
+        # false until every saved element is back in the scene; saving earlier would upsert half a project
+        self._project_loaded = False
         self.sound_path = None
         self.ai_generated_code = ""
-        self.all_classes = get_exposed_classes()
-        self.all_names = sorted([c.__name__ for c in self.all_classes], key=str.lower)
-        self.class_map = {c.__name__: c for c in self.all_classes}
+        self.ai_backend = None
+        self.ai_cache = ResponseCache()
+        self.ai_thread = None
+        self.catalog = ClassCatalog()
+        self.search_index = SearchIndex()
+        self.elements_model = ElementsListModel(self)
+        self.thumbnails = ThumbnailStore()
+        self.elements_model.set_thumbnails(self.thumbnails, self.catalog)
+        self.thumbnail_timer = QTimer(self)
+        self.thumbnail_timer.setInterval(250)
+        self.thumbnail_timer.timeout.connect(lambda: self.elements_model.thumbnails_ready(self.thumbnails.drain()))
+        self.thumbnail_timer.start()
+        self.elements_proxy = RankedFilterProxy(self.search_index, self)
+        self.elements_proxy.setSourceModel(self.elements_model)
+        self.elements_proxy.sort(0)
         self.search_timer = QTimer(self)
         self.search_timer.setSingleShot(True)
         self.search_timer.setInterval(120)
-        self.scene_elements = []
+        self.search_timer.timeout.connect(self._apply_search)
+        self.code_model = CodeModel()
+        self.scene_index = SceneIndex()
+        self.history = History()
+        self.script_writer = DebouncedWriter("script.py", parent=self)
+        self.render_daemon = RenderDaemon()
+        self.render_daemon.warm_up()
+        self.log_buffer = LogBuffer(capacity=5000, spill_path=Path(".logs") / "session.log")
+        self._migrate_props_json(Path("props.json"))
+        # quality upgrades get their own worker so preempting one leaves render_daemon warm
+        self.upgrade_daemon = RenderDaemon()
+        self.upgrade_daemon.warm_up()
+        self.scheduler = RenderScheduler(self.render_daemon, Path(".jobs").resolve(), self.log_buffer.push,
+                                         self.upgrade_daemon, self)
+        self.scheduler.output.connect(self.open_output)
+        self.hot_reload = HotReloader(self.log_buffer.push, self)
+        self.hot_reload.watch(self.script_writer.path)
+        self.hot_reload.changed.connect(self.on_watched_change)
+        # frame previews get their own worker so they never queue behind a full render
+        self.frame_daemon = RenderDaemon()
+        self.frame_daemon.warm_up()
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(150)
+        self.preview_timer.timeout.connect(self.refresh_preview)
+        # validation shares the warm frame worker; a dry run is far cheaper than a failed render
+        self.validator = Validator(self.frame_daemon, Path(".jobs").resolve() / "validate", self)
+        self.validator.checked.connect(self.on_validated)
+        self.validator.failed.connect(lambda text: self.log(f"Could not validate the scene: {text}", "validate", "WARNING"))
+        self._unvalidated = None
+        self._gated = None
+        self._ladder_key = None
+        self._shown_problems = []
+        self.validate_timer = QTimer(self)
+        self.validate_timer.setSingleShot(True)
+        self.validate_timer.setInterval(300)
+        self.validate_timer.timeout.connect(lambda: self.validator.check(self.code.toPlainText()))
         self.props = PropertiesTable()
         self.setup_actions()
         self.setup_central()
         self.setup_docks()
-        self.refresh_elements_list()
         self.update_code()
+        self.load_catalog_async()
+
+    def log(self, text, source="editor", level=None):
+        self.log_buffer.push(source, text, level)
+
+    def load_catalog_async(self):
+        self.log("Loading elements...", "catalog")
+        self.catalog_thread = CatalogThread()
+        self.catalog_thread.batch.connect(self.on_catalog_batch)
+        self.catalog_thread.log.connect(lambda ln: self.log(ln, "catalog", "ERROR"))
+        self.catalog_thread.finished.connect(
+            lambda: self.log(f"Loaded {len(self.catalog)} elements", "catalog")
+        )
+        # saved elements resolve their classes through the catalog, so they load after it
+        self.catalog_thread.finished.connect(self.load_project)
+        self.catalog_thread.start()
+
+    def on_catalog_batch(self, entries):
+        added = self.catalog.extend(entries)
+        if not added:
+            return
+        self.search_index.add(added)
+        self.elements_model.add_names(added)
+        if self.search.text():
+            self._apply_search()
 
     def setup_actions(self):
         bar = self.menuBar()
@@ -216,7 +221,7 @@ class EditorWindow(QMainWindow):
         act_save_script.setShortcut("Ctrl+Shift+S")
         act_save_script.triggered.connect(self.save_script)
         filem.addAction(act_save_script)
-        act_save_props = QAction("Save Element Props", self)
+        act_save_props = QAction("Save Project", self)
         act_save_props.setShortcut("Ctrl+S")
         act_save_props.triggered.connect(self.save_current_element)
         filem.addAction(act_save_props)
@@ -227,6 +232,16 @@ class EditorWindow(QMainWindow):
         act_import.triggered.connect(self.import_props)
         filem.addAction(act_import)
         editm = bar.addMenu("Edit")
+        self.act_undo = QAction("Undo", self)
+        self.act_undo.setShortcut("Ctrl+Z")
+        self.act_undo.setEnabled(False)
+        self.act_undo.triggered.connect(self.undo)
+        editm.addAction(self.act_undo)
+        self.act_redo = QAction("Redo", self)
+        self.act_redo.setShortcuts(["Ctrl+Y", "Ctrl+Shift+Z"])
+        self.act_redo.setEnabled(False)
+        self.act_redo.triggered.connect(self.redo)
+        editm.addAction(self.act_redo)
         act_add_elem = QAction("Add Selected Element", self)
         act_add_elem.setShortcut("Ctrl+E")
         act_add_elem.triggered.connect(self.add_element_from_pool)
@@ -254,6 +269,15 @@ class EditorWindow(QMainWindow):
         act_render = QAction("Render", self)
         act_render.triggered.connect(self.render_scene)
         runm.addAction(act_render)
+        runm.addSeparator()
+        self.act_hot_reload = QAction("Hot Reload", self)
+        self.act_hot_reload.setCheckable(True)
+        self.act_hot_reload.setShortcut("Ctrl+Shift+R")
+        self.act_hot_reload.toggled.connect(self.set_hot_reload)
+        runm.addAction(self.act_hot_reload)
+        act_watch = QAction("Watch Script...", self)
+        act_watch.triggered.connect(self.watch_script)
+        runm.addAction(act_watch)
         aim = bar.addMenu("AI")
         act_generate = QAction("Generate With AI", self)
         act_generate.setShortcut("Ctrl+G")
@@ -278,6 +302,18 @@ class EditorWindow(QMainWindow):
         code_bar.addWidget(self.res_w)
         code_bar.addWidget(QLabel("H"))
         code_bar.addWidget(self.res_h)
+        self.workers = QSpinBox()
+        self.workers.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers.setValue(default_workers())
+        self.workers.setToolTip("Worker processes used by Render")
+        self.chunk_size = QSpinBox()
+        self.chunk_size.setRange(1, 100)
+        self.chunk_size.setValue(1)
+        self.chunk_size.setToolTip("Animations rendered per worker task")
+        code_bar.addWidget(QLabel("Workers"))
+        code_bar.addWidget(self.workers)
+        code_bar.addWidget(QLabel("Segment"))
+        code_bar.addWidget(self.chunk_size)
         code_bar.addStretch(1)
         lay.addLayout(code_bar)
         self.code = QPlainTextEdit()
@@ -298,17 +334,23 @@ class EditorWindow(QMainWindow):
         self.search.setPlaceholderText("Search elements")
         self.search.textChanged.connect(self._schedule_search)
         v.addWidget(self.search)
-        self.elements_list = QListWidget()
-        self.elements_list.itemDoubleClicked.connect(self.add_element_from_pool)
+        self.elements_list = QListView()
+        self.elements_list.setUniformItemSizes(True)
+        self.elements_list.setIconSize(QSize(THUMB_SIZE[0] // 2, THUMB_SIZE[1] // 2))
+        self.elements_list.setModel(self.elements_proxy)
+        self.elements_list.doubleClicked.connect(self.add_element_from_pool)
         v.addWidget(self.elements_list, 1)
         self.elements_dock.setWidget(elw)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.elements_dock)
         self._lock_dock(self.elements_dock)
 
         self.elements_tree_dock = QDockWidget("Elements Tree", self)
-        self.elements = QTreeWidget()
+        self.elements = QTreeView()
         self.elements.setHeaderHidden(True)
-        self.elements.itemSelectionChanged.connect(self.on_elements_select)
+        self.elements.setRootIsDecorated(False)
+        self.elements.setUniformRowHeights(True)
+        self.elements.setModel(self.scene_model)
+        self.elements.selectionModel().currentChanged.connect(self.on_elements_select)
         self.elements.setContextMenuPolicy(Qt.CustomContextMenu)
         self.elements.customContextMenuRequested.connect(self.show_elements_menu)
         self.elements_tree_dock.setWidget(self.elements)
@@ -324,12 +366,40 @@ class EditorWindow(QMainWindow):
         self._lock_dock(self.props_dock)
 
         self.logs_dock = QDockWidget("Logs", self)
-        self.logs = QPlainTextEdit()
-        self.logs.setReadOnly(True)
+        self.logs = LogView(self.log_buffer)
         self.logs_dock.setWidget(self.logs)
         self.addDockWidget(Qt.BottomDockWidgetArea, self.logs_dock)
         self._lock_dock(self.logs_dock)
 
+        self.profiler_dock = QDockWidget("Profiler", self)
+        self.profiler = ProfilerPanel(TelemetryHistory())
+        self.profiler.line_activated.connect(self.goto_code_line)
+        self.scheduler.profiled.connect(self.profiler.show_run)
+        self.profiler_dock.setWidget(self.profiler)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.profiler_dock)
+        self._lock_dock(self.profiler_dock)
+        self.tabifyDockWidget(self.logs_dock, self.profiler_dock)
+        self.logs_dock.raise_()
+
+        self.preview_dock = QDockWidget("Preview", self)
+        self.preview = PreviewPanel(self.frame_daemon, Path(".jobs").resolve() / "frames", self.log_buffer.push)
+        self.preview_dock.setWidget(self.preview)
+        self.sound_track = SoundTrack(self.preview.waveform, self.log_buffer.push)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.preview_dock)
+        self._lock_dock(self.preview_dock)
+        self.splitDockWidget(self.preview_dock, self.props_dock, Qt.Vertical)
+        self.preview_dock.visibilityChanged.connect(lambda visible: visible and self.preview_timer.start())
+
+        self.playback_dock = QDockWidget("Playback", self)
+        self.playback = PlaybackPanel()
+        self.playback_dock.setWidget(self.playback)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.playback_dock)
+        self._lock_dock(self.playback_dock)
+        self.tabifyDockWidget(self.preview_dock, self.playback_dock)
+        self.preview_dock.raise_()
+        self.res_w.valueChanged.connect(self.preview_timer.start)
+        self.res_h.valueChanged.connect(self.preview_timer.start)
+
         self.misc_dock = QDockWidget("Actions", self)
         mw = QWidget()
         mv = QVBoxLayout(mw)
@@ -347,7 +417,13 @@ class EditorWindow(QMainWindow):
         self.btn_del.clicked.connect(self.delete_selected)
         for btn in [self.btn_add_sound, self.btn_add_elem, self.btn_dup, self.btn_del, self.btn_preview, self.btn_render]:
             mv.addWidget(btn)
-        mv.addStretch(1)
+        mv.addWidget(QLabel("Render queue"))
+        self.queue_view = QListWidget()
+        mv.addWidget(self.queue_view, 1)
+        self.btn_cancel_job = QPushButton("Cancel Job")
+        self.btn_cancel_job.clicked.connect(self.cancel_selected_job)
+        mv.addWidget(self.btn_cancel_job)
+        self.scheduler.changed.connect(self.refresh_queue_view)
         self.misc_dock.setWidget(mw)
         self.addDockWidget(Qt.RightDockWidgetArea, self.misc_dock)
         self._lock_dock(self.misc_dock)
@@ -369,287 +445,462 @@ class EditorWindow(QMainWindow):
         self._lock_dock(self.ai_dock)
         
     def on_props_changed(self, vals):
-        item = self.elements.currentItem()
-        if not item:
+        element = self.current_element()
+        if element:
+            self._update_element_props(element.uid, vals)
+
+    def _new_element(self, display_name, props, uid=None, span=None):
+        cls_name = split_display_name(display_name)[1]
+        element = self.scene.create(display_name, props, uid=uid, span=span, schema=self.catalog.schema(cls_name))
+        element.cls = self.catalog.get_class(element.cls_name)
+        return element
+
+    def current_element(self):
+        return self.scene_model.element_at(self.elements.currentIndex())
+
+    def _migrate_props_json(self, path):
+        if len(self.project) or not path.exists():
             return
-        cls = item.data(0, Qt.UserRole).get("cls")
-        props = item.data(0, Qt.UserRole).get("props", {})
-        
-        for k, v in vals.items():
-            try:
-                if isinstance(v, str):
-                    if re.match(r"^-?\d+(\.\d+)?$", v):
-                        props[k] = float(v) if "." in v else int(v)
-                    elif re.match(r"^[A-Z_]+$", v):  
-                        props[k] = v
-                    else:
-                        props[k] = v
-                else:
-                    props[k] = v
-            except:
-                props[k] = v
-
-        item.setData(0, Qt.UserRole, {"cls": cls, "props": props})
-        self.update_code()
+        try:
+            count = self.project.import_props(json.loads(path.read_text(encoding="utf-8")), split_display_name)
+        except (OSError, ValueError) as e:
+            self.log(f"Could not migrate {path}: {e}")
+            return
+        if count:
+            self.log(f"Moved {count} elements from {path} into {self.project.path}")
+
+    def load_project(self):
+        settings = self.project.settings()
+        self.sound_path = settings.get("sound_path", self.sound_path)
+        self.ai_generated_code = settings.get("ai_code", self.ai_generated_code)
+        for key, box in (("pixel_width", self.res_w), ("pixel_height", self.res_h),
+                         ("workers", self.workers), ("chunk_size", self.chunk_size)):
+            if key in settings:
+                box.setValue(settings[key])
+        self._project_batches = self.project.iter_elements()
+        self._load_project_batch()
+
+    def _load_project_batch(self):
+        # one batch per event-loop turn keeps the window responsive on large projects
+        batch = next(self._project_batches, None)
+        if batch is None:
+            self._project_batches = None
+            self._project_loaded = True
+            self.update_code()
+            if len(self.project):
+                self.log(f"Loaded {len(self.scene)} elements from {self.project.path}")
+            return
+        self.scene_model.extend([self._new_element(e["name"], e["props"], e["uid"]) for e in batch])
+        QTimer.singleShot(0, self._load_project_batch)
+
+    def _scene_locked(self):
+        # rows added or removed mid-load would interleave with the saved batches still arriving
+        if self._project_loaded:
+            return False
+        self.log("Project is still loading, try again in a moment")
+        return True
+
+    def project_settings(self):
+        return {
+            "sound_path": self.sound_path,
+            "ai_code": self.ai_generated_code,
+            "pixel_width": self.res_w.value(),
+            "pixel_height": self.res_h.value(),
+            "workers": self.workers.value(),
+            "chunk_size": self.chunk_size.value(),
+        }
+
+    def _record(self, element, row=None):
+        row = self.scene.row(element.uid) if row is None else row
+        return row, make_record(element.uid, element.name, element.cls_name, element.props)
+
+    def _frame(self):
+        return self.ai_generated_code, self.sound_path
+
+    def _commit(self, label, changes, frame=None, coalesce=None):
+        self.history.commit(label, changes, frame, coalesce)
+        self.act_undo.setEnabled(self.history.can_undo())
+        self.act_redo.setEnabled(self.history.can_redo())
+
+    def _commit_added(self, label, elements):
+        changes = {}
+        for element in elements:
+            after = self._record(element)
+            changes[element.uid] = (None, after)
+        self._commit(label, changes)
+
+    def undo(self):
+        if self._scene_locked():
+            return
+        step = self.history.undo()
+        if step:
+            self._apply_step(step, 0)
+            self.log(f"Undo: {step.label}")
+
+    def redo(self):
+        if self._scene_locked():
+            return
+        step = self.history.redo()
+        if step:
+            self._apply_step(step, 1)
+            self.log(f"Redo: {step.label}")
+
+    def _apply_step(self, step, side):
+        self.history.suspended = True
+        try:
+            changed = step.changes
+            targets = sorted((change[side] for change in changed.values() if change[side]), key=lambda t: t[0])
+            if len(changed) > 16:
+                # bulk steps rebuild the order in one pass instead of per-row inserts
+                elements = [e for e in self.scene if e.uid not in changed]
+                for row, record in targets:
+                    elements.insert(row, self._new_element(record.name, dict(record.props), record.uid))
+                self.scene_model.reset(elements)
+            else:
+                for uid in changed:
+                    self.scene_model.remove(uid)
+                for row, record in targets:
+                    self.scene_model.insert(self._new_element(record.name, dict(record.props), record.uid), row)
+            if step.frame:
+                self.ai_generated_code, self.sound_path = step.frame[side]
+            # the properties panel would otherwise write its stale values back on the next sync
+            if self.current_element():
+                self.on_elements_select()
+            else:
+                self.props.clear_props()
+            self.update_code()
+        finally:
+            self.history.suspended = False
+        self.act_undo.setEnabled(self.history.can_undo())
+        self.act_redo.setEnabled(self.history.can_redo())
 
     def _schedule_search(self):
-        self.search_timer.stop()
-        self.search_timer.timeout.connect(self._apply_search)
         self.search_timer.start()
 
     def _apply_search(self):
-        txt = self.search.text().lower()
-        self.elements_list.clear()
-        for name in self.all_names:
-            if txt in name.lower():
-                QListWidgetItem(name, self.elements_list)
-
-    def refresh_elements_list(self):
-        self.elements_list.clear()
-        for name in self.all_names:
-            QListWidgetItem(name, self.elements_list)
+        self.elements_proxy.set_query(self.search.text())
             
-    def rebuild_elements_tree_from_code(self, code_text):
-        self.elements.clear()
-        self.props_data.clear()
-        import ast
-
+    def rebuild_elements_tree_from_code(self, code_text, frame=None):
         try:
-            if "class " in code_text and "Scene" in code_text:
-                tree = ast.parse(code_text)
-            else:
-                code_wrapped = "class DummyScene(Scene):\n"
-                for line in code_text.splitlines():
-                    code_wrapped += "    " + line + "\n"
-                tree = ast.parse(code_wrapped)
-        except Exception as e:
-            self.logs.appendPlainText(f"Failed to parse code: {e}")
-            return
-
-        def extract_calls(node):
-            elements = []
-            if isinstance(node, ast.Assign):
-                if isinstance(node.value, ast.Call):
-                    elements.append((node.targets[0].id, node.value))
-            elif isinstance(node, ast.Expr):
-                if isinstance(node.value, ast.Call):
-                    call = node.value
-                    if hasattr(call.func, "id") or hasattr(call.func, "attr"):
-                        elements.append((None, call))
-            for child in ast.iter_child_nodes(node):
-                elements.extend(extract_calls(child))
-            return elements
-
-        scene_body = []
-        
-        for n in tree.body:
-            if isinstance(n, ast.ClassDef):
-                for base in n.bases:
-                    if getattr(base, "id", None) == "Scene":
-                        scene_body = n.body
-                        break
-
-        calls = []
-        for node in scene_body:
-            calls.extend(extract_calls(node))
-
-        for idx, (var_name, call) in enumerate(calls):
-            cls_node = call.func
-            cls_name = cls_node.id if isinstance(cls_node, ast.Name) else getattr(cls_node, "attr", "Unknown")
-            params = {}
-            for i, arg in enumerate(call.args):
-                try:
-                    params[f"arg{i}"] = ast.literal_eval(arg)
-                except:
-                    params[f"arg{i}"] = None
-            for kw in call.keywords:
-                try:
-                    params[kw.arg] = ast.literal_eval(kw.value)
-                except:
-                    params[kw.arg] = None
-            display_name = f"{var_name or f'{cls_name}_{idx}'} ({cls_name})"
-            item = QTreeWidgetItem([display_name])
-            self.elements.addTopLevelItem(item)
-            self.props_data[display_name] = params
-            cls = self.class_map.get(cls_name)
-            item.setData(0, Qt.UserRole, {"cls": cls, "props": params})
-            
+            found = self.scene_index.update(code_text)
+        except (SyntaxError, ValueError) as e:
+            self.log(f"Failed to parse code: {e}")
+            return
+        changes = {e.uid: (self._record(e, row), None) for row, e in enumerate(self.scene)}
+        elements = []
+        for idx, element in enumerate(found):
+            display_name = f"{element.var_name or f'{element.cls_name}_{idx}'} ({element.cls_name})"
+            elements.append(self._new_element(display_name, element.params, span=element.span))
+        self.scene_model.reset(elements)
+        for row, element in enumerate(elements):
+            changes[element.uid] = (None, self._record(element, row))
+        self._commit("Load code", changes, frame)
+
     def add_element_from_pool(self):
-        it = self.elements_list.currentItem()
-        if not it:
-            return
-        cls_name = it.text().replace(" [Effect]", "")
-        names = self.current_elements_names()
-        base_var = re.sub(r"[^0-9a-zA-Z_]+", "_", cls_name).lower()
-        new_var = base_var
-        count = 1
-        while any(new_var in n for n in names):
-            count += 1
-            new_var = f"{base_var}{count}"
-        display_name = f"{new_var} ({cls_name})"
-        
-        node = QTreeWidgetItem([display_name])
-        self.elements.addTopLevelItem(node)
-        if display_name not in self.props_data:
-            self.props_data[display_name] = {}
-        
-        cls = self.class_map.get(cls_name)
-        node.setData(0, Qt.UserRole, {"cls": cls, "props": {}})
-        if cls:
-            self.show_properties_for(cls)
-        self.update_code()
-        
-    def current_elements_names(self):
-        names = []
-        root = self.elements.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
-            names.append(item.text(0))
-        return names
-    
-    def on_elements_select(self):
-        item = self.elements.currentItem()
-        if not item:
+        if self._scene_locked():
             return
-        data = item.data(0, Qt.UserRole)
-        if not data:
+        idx = self.elements_list.currentIndex()
+        if not idx.isValid():
             return
-        cls = data.get("cls")
-        
-        self.props.show_properties(cls)
-        if "color" in get_class_init_params(cls):
-            self.props.add_color_picker()
-            
+        cls_name = idx.data().replace(" [Effect]", "")
+        new_var = self.scene.unique_var(var_name_for(cls_name))
+        element = self._new_element(f"{new_var} ({cls_name})", {})
+        self.scene_model.insert(element)
+        self._commit_added("Add element", [element])
+
+        if element.cls:
+            self.show_properties_for(element.cls)
+        self.update_code()
+
+    def on_elements_select(self, *args):
+        element = self.current_element()
+        if not element:
+            return
+
+        self.props.show_properties(self.class_schema(element.cls), element.props)
+
         self.props.valueChanged.disconnect()
-        self.props.valueChanged.connect(lambda v, it=item: self._update_element_props(it, v))
+        self.props.valueChanged.connect(lambda v, uid=element.uid: self._update_element_props(uid, v))
 
-    def _update_element_props(self, item, vals):
-        cls = item.data(0, Qt.UserRole).get("cls")
-        item.setData(0, Qt.UserRole, {"cls": cls, "props": vals})
+    def _update_element_props(self, uid, vals):
+        element = self.scene.get(uid)
+        if element is None:
+            return
+        before = self._record(element)
+        self.scene_model.set_props(uid, vals)
+        after = self._record(element, before[0])
+        if before != after:
+            # a slider drag arrives as a burst of edits to one element; keep it as one step
+            self._commit("Edit properties", {uid: (before, after)}, coalesce=("props", uid))
         self.update_code()
-        
+
+    def class_schema(self, cls):
+        return self.catalog.schema(cls.__name__) if cls else None
+
     def show_properties_for(self, cls):
         if not cls:
             return
-        self.props.show_properties(cls)
-        if "color" in get_class_init_params(cls):
-            self.props.add_color_picker()
+        self.props.show_properties(self.class_schema(cls))
             
     def duplicate_selected(self):
-        item = self.elements.currentItem()
-        if not item:
+        if self._scene_locked():
+            return
+        element = self.current_element()
+        if not element:
             return
-        name = item.text(0)
-        cls = item.data(0, Qt.UserRole).get("cls")
-        props = dict(item.data(0, Qt.UserRole).get("props", {}))
 
         # ensure unique name
-        base_name = name.split(" (")[0]
-        cls_name = name.split(" (")[1][:-1] if "(" in name else name
-        count = 1
-        new_name = f"{base_name}_copy"
-        while new_name in self.current_elements_names():
-            count += 1
-            new_name = f"{base_name}_copy{count}"
-        display_name = f"{new_name} ({cls_name})"
-
-        # create tree item
-        clone = QTreeWidgetItem([display_name])
-        clone.setData(0, Qt.UserRole, {"cls": cls, "props": props})
-        self.elements.addTopLevelItem(clone)
-
-        # store props
-        self.props_data[display_name] = props
+        new_name = self.scene.unique_var(f"{element.var_name}_copy")
+        clone = self._new_element(f"{new_name} ({element.cls_name})", dict(element.props))
+        self.scene_model.insert(clone)
+        self._commit_added("Duplicate element", [clone])
 
         # refresh code
         self.update_code()
 
     def delete_selected(self):
-        item = self.elements.currentItem()
-        if item:
-            index = self.elements.indexOfTopLevelItem(item)
-            self.elements.takeTopLevelItem(index)
+        if self._scene_locked():
+            return
+        element = self.current_element()
+        if element:
+            before = self._record(element)
+            self.scene_model.remove(element.uid)
+            self._commit("Delete element", {element.uid: (before, None)})
             self.update_code()
 
     def preview_scene(self):
         self.sync_current_props()
         self.update_code()
-        code_path = Path("temp_scene.py")
-        code_path.write_text(self.code.toPlainText(), encoding="utf-8")
-        cmd = [sys.executable, "-m", "manim", str(code_path), "-pql", "-p"]
-        self.logs.appendPlainText("Previewing scene...")
-        self._run_cmd(cmd)
+        self.log("Previewing scene...")
+        self._run_ladder()
 
     def render_scene(self):
         self.sync_current_props()
         self.update_code()
-        code_path = Path("temp_scene.py")
-        code_path.write_text(self.code.toPlainText(), encoding="utf-8")
         w, h = self.res_w.value(), self.res_h.value()
-        cmd = [sys.executable, "-m", "manim", str(code_path), "-ql", f"--media_dir=media", f"--fps=60", f"--resolution={w},{h}", "-p"]
-        self.logs.appendPlainText("Rendering scene...")
-        self._run_cmd(cmd)
-
-    def _run_cmd(self, cmd):
-        self.proc = ProcThread(cmd)
-        self.proc.line.connect(lambda ln: self.logs.appendPlainText(ln))
-        self.proc.start()
-        
+        self.log("Rendering scene...")
+        self._run_render(
+            "render", {"quality": "low_quality", "frame_rate": 60, "pixel_width": w, "pixel_height": h},
+            workers=self.workers.value(), chunk_size=self.chunk_size.value(),
+        )
+
+    def _validated_source(self, kind, retry):
+        source = self.code.toPlainText()
+        problems = self.validator.result(source)
+        if problems is None and source_key(source) == self._unvalidated:
+            self.log(f"Validation unavailable, starting the {kind} anyway", level="WARNING")
+            return source
+        if problems is None:
+            self._gated = (source_key(source), retry)
+            self.log(f"Validating scene before {kind}...")
+            self.validator.check(source)
+            return None
+        if problems:
+            self.log(f"{kind.title()} skipped: the scene fails validation", level="ERROR")
+            for problem in problems:
+                self.log(problem["traceback"], "validate", "ERROR")
+            return None
+        return source
+
+    def _render_job(self, source, config, workers=1, chunk_size=1):
+        return {
+            "source": source,
+            "scene_length": self.validator.length(source),
+            "module": "temp_scene",
+            "config": dict(config, media_dir=str(Path("media").resolve())),
+            "workers": workers,
+            "chunk_size": chunk_size,
+        }
+
+    def _run_render(self, kind, config, workers=1, chunk_size=1, label=None):
+        source = self._validated_source(kind, lambda: self._run_render(kind, config, workers, chunk_size, label))
+        if source is None:
+            return
+        self.scheduler.submit(kind, self._render_job(source, config, workers, chunk_size), label)
+
+    def _run_ladder(self):
+        source = self._validated_source("preview", self._run_ladder)
+        if source is None:
+            return
+        # a new ladder makes every rung of the previous one stale
+        self.scheduler.supersede(LADDER_GROUP)
+        self._ladder_key = source_key(source)
+        self.playback.start_ladder()
+        self.playback_dock.raise_()
+        ladder = quality_ladder(self.res_w.value(), self.res_h.value())
+        for rank, (label, config) in enumerate(ladder):
+            last = rank == len(ladder) - 1
+            job = self._render_job(source, config, self.workers.value() if last else 1, self.chunk_size.value())
+            self.scheduler.submit("draft" if rank == 0 else "upgrade", job, label, LADDER_GROUP)
+
+    def _cancel_stale_ladder(self):
+        if self._ladder_key is None or not self.scheduler.has_group(LADDER_GROUP):
+            return
+        if source_key(self.code.toPlainText()) != self._ladder_key:
+            self._ladder_key = None
+            self.scheduler.supersede(LADDER_GROUP)
+            self.log("Scene changed, cancelled the pending preview upgrades")
+
+    def set_hot_reload(self, enabled):
+        self.hot_reload.set_enabled(enabled)
+        self.log("Hot reload on" if enabled else "Hot reload off")
+        if enabled:
+            # the first pass fills the segment cache that later edits render against
+            self.hot_reload.reset()
+            self.hot_render(self.code.toPlainText())
+
+    def watch_script(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Watch Script", "", "Python Files (*.py)")
+        if not path:
+            return
+        self.hot_reload.watch(path)
+        self.log(f"Watching {path}")
+        if not self.act_hot_reload.isChecked():
+            self.act_hot_reload.setChecked(True)
+
+    def on_watched_change(self, path, text):
+        if not self.hot_reload.enabled:
+            return
+        if Path(path) == self.script_writer.path.resolve():
+            # the editor's own output only ever triggers a render, never a reload
+            if not self.script_writer.owns(text):
+                self.log("script.py is rewritten by the editor; use Watch Script... for hand-edited scenes",
+                         level="WARNING")
+                return
+        elif text != self.code_model.text:
+            self.log(f"Reloading {path}")
+            self._load_script(text)
+        self.hot_render(self.code.toPlainText())
+
+    def hot_render(self, source):
+        first = self.hot_reload.diff(source)
+        if first is None:
+            return
+        self.log(f"Hot reload: re-rendering from animation {first + 1}, earlier segments come from the cache")
+        self._run_render("preview", {"quality": "low_quality"}, label=HOT_RELOAD_LABEL)
+        if self.preview_dock.isVisible():
+            self.preview.refresh(source, self.res_w.value(), self.res_h.value())
+            self.preview.seek_play(first + 1)
+
+    def on_validated(self, key, problems):
+        if problems is None:
+            # the render itself will surface real errors; a worker hiccup must not block it
+            self._unvalidated = key
+        else:
+            self.mark_problems(problems)
+        gated, self._gated = self._gated, None
+        if gated and gated[0] == key and key == source_key(self.code.toPlainText()):
+            gated[1]()
+
+    def mark_problems(self, problems):
+        lines = {}
+        for problem in problems:
+            if problem["line"]:
+                lines.setdefault(problem["line"], problem["message"])
+        marked = {}
+        for element in self.scene:
+            # generated elements own one code line; parsed scripts carry the span they came from
+            row = self.code_model.line_span(element.uid)
+            if row is not None:
+                first = last = row + 1
+            elif element.span:
+                first, last = element.span[0], element.span[2]
+            else:
+                continue
+            message = next((m for line, m in lines.items() if first <= line <= last), None)
+            if message:
+                marked[element.uid] = message
+        self.scene_model.set_problems(marked)
+        if problems == self._shown_problems:
+            return
+        self._shown_problems = problems
+        for problem in problems:
+            where = f"line {problem['line']}: " if problem["line"] else ""
+            self.log(f"Validation failed at {where}{problem['message']}", "validate", "WARNING")
+
+    def refresh_queue_view(self):
+        self.queue_view.clear()
+        for job in self.scheduler.jobs():
+            self.queue_view.addItem(job.describe())
+            self.queue_view.item(self.queue_view.count() - 1).setData(Qt.UserRole, job.id)
+
+    def cancel_selected_job(self):
+        item = self.queue_view.currentItem()
+        if not item:
+            return
+        job_id = item.data(Qt.UserRole)
+        for job in self.scheduler.jobs():
+            if job.id == job_id:
+                self.scheduler.cancel(job)
+                break
+
+    def goto_code_line(self, line):
+        block = self.code.document().findBlockByNumber(line - 1)
+        if not block.isValid():
+            return
+        cursor = QTextCursor(block)
+        cursor.select(QTextCursor.LineUnderCursor)
+        self.code.setTextCursor(cursor)
+        self.code.centerCursor()
+
+    def open_output(self, path, label=""):
+        self.log(f"Output: {path}")
+        if label == HOT_RELOAD_LABEL:
+            self.hot_reload.rendered()
+            return
+        rank = ladder_rank(label)
+        if rank is not None:
+            self.playback.offer(rank, label, path)
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
     def save_script(self):
         code_text = self.code.toPlainText()
         path, _ = QFileDialog.getSaveFileName(self, "Save Script", "script.py", "Python Files (*.py)")
         if path:
             Path(path).write_text(code_text, encoding="utf-8")
-            self.logs.appendPlainText(f"Saved script to {path}")
+            self.log(f"Saved script to {path}")
             
     def save_current_element(self):
-        item = self.elements.currentItem()
-        if not item:
+        if self._scene_locked():
             return
-
-        # Update props_data with the current element's properties
-        self.props_data[item.text(0)] = item.data(0, Qt.UserRole).get("props", {})
-
-        # Save props.json
-        self.props_path.write_text(json.dumps(self.props_data, indent=4), encoding="utf-8")
-        self.logs.appendPlainText(f"Saved properties of {item.text(0)}")
+        self.sync_current_props()
+        written, removed = self.project.sync((e.uid, e.name, e.cls_name, e.props) for e in self.scene)
+        self.project.save_settings(self.project_settings())
+        self.log(f"Saved project: {written} elements written, {removed} removed")
 
         # Refresh code and write to script.py
         self.update_code()
-        Path("script.py").write_text(self.code.toPlainText(), encoding="utf-8")
-        self.logs.appendPlainText("Synced props into script.py")
+        self.script_writer.flush()
+        self.log("Synced props into script.py")
 
     def export_props(self):
         path, _ = QFileDialog.getSaveFileName(self, "Export Props JSON", "", "JSON Files (*.json)")
         if not path:
             return
-        all_props = {}
-        for i in range(self.elements.topLevelItemCount()):
-            itm = self.elements.topLevelItem(i)
-            all_props[itm.text(0)] = itm.data(0, Qt.UserRole).get("props", {})
+        all_props = {e.name: e.props for e in self.scene}
         Path(path).write_text(json.dumps(all_props, indent=4), encoding="utf-8")
-        self.logs.appendPlainText(f"Exported props to {path}")
+        self.log(f"Exported props to {path}")
         
     def import_props(self):
+        if self._scene_locked():
+            return
         path, _ = QFileDialog.getOpenFileName(self, "Import Props JSON", "", "JSON Files (*.json)")
         if not path:
             return
         try:
             data = json.loads(Path(path).read_text(encoding="utf-8"))
-            for name, props in data.items():
-                cls = self.class_map.get(name)
-                if not cls:
-                    continue
-                item = QTreeWidgetItem([name])
-                item.setData(0, Qt.UserRole, {"cls": cls, "props": props})
-                self.elements.addTopLevelItem(item)
-            self.logs.appendPlainText(f"Imported props from {path}")
+            added = [self._new_element(name, props) for name, props in data.items()]
+            added = [e for e in added if e.cls]
+            self.scene_model.extend(added)
+            self._commit_added("Import props", added)
+            self.update_code()
+            self.log(f"Imported props from {path}")
         except Exception as e:
-            self.logs.appendPlainText(f"Failed import: {e}")
+            self.log(f"Failed import: {e}")
 
     def show_elements_menu(self, pos):
-        item = self.elements.itemAt(pos)
-        if not item:
+        if not self.elements.indexAt(pos).isValid():
             return
         menu = QMenu()
         act_dup = QAction("Duplicate", self)
@@ -664,126 +915,119 @@ class EditorWindow(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(self, "Select Sound File", "", "Audio Files (*.mp3 *.wav)")
         if not path:
             return
+        before = self._frame()
         self.sound_path = path
-        self.logs.appendPlainText(f"Added sound: {path}")
+        self._commit("Add sound", {}, (before, self._frame()))
+        self.log(f"Added sound: {path}")
+        self.update_code()
 
     def update_code(self):
-        def format_param(k, v):
-            if isinstance(v, str):
-                if v.startswith("!") and v.endswith("!"):
-                    return None
-                elif v.startswith("$") and v.endswith("$"):
-                    inner = v[1:-1]
-                    return f"{k}={inner}"
-                else:
-                    return f"{k}={repr(v)}"
-            else:
-                return f"{k}={v}"
-
         self.sync_current_props()
-        if self.ai_generated_code:
-            code = self.ai_generated_code
-            lines = code.splitlines()
-            insert_idx = None
-            for i, line in enumerate(lines):
-                if line.strip().startswith("def construct"):
-                    insert_idx = i + 1
-                    break
-            if insert_idx:
-                if self.sound_path and "self.add_sound" not in "\n".join(lines):
-                    lines.insert(insert_idx, f'        self.add_sound(r"{self.sound_path}")')
-
-                for i in range(self.elements.topLevelItemCount()):
-                    item = self.elements.topLevelItem(i)
-                    name = item.text(0)
-                    cls_name = name.split(" (")[1][:-1] if "(" in name else name
-                    raw_params = self.props_data.get(name, {})
-
-                    param_parts = []
-                    for k, v in raw_params.items():
-                        part = format_param(k, v)
-                        if part:
-                            param_parts.append(part)
-                    param_str = ", ".join(param_parts)
-
-                    cls = self.class_map.get(cls_name)
-                    if not cls:
-                        continue
-
-                    if class_in_manim_animations(cls):
-                        new_line = f"        self.play({cls_name}({param_str}))"
-                    else:
-                        var_name = re.sub(r"[^0-9a-zA-Z_]+", "_", name.split(" (")[0]).lower()
-                        new_line = f"        {var_name} = {cls_name}({param_str})"
-
-                    lines.insert(insert_idx, new_line)
-
-            code = "\n".join(lines)
-        else:
-            lines = ["from manim import *", "", "class Output(Scene):", "    def construct(self):"]
-            if self.sound_path:
-                lines.append(f'        self.add_sound(r"{self.sound_path}")')
-
-            for i in range(self.elements.topLevelItemCount()):
-                item = self.elements.topLevelItem(i)
-                name = item.text(0)
-                cls_name = name.split(" (")[1][:-1] if "(" in name else name
-                raw_params = self.props_data.get(name, {})
-
-                param_parts = []
-                for k, v in raw_params.items():
-                    part = format_param(k, v)
-                    if part:
-                        param_parts.append(part)
-                param_str = ", ".join(param_parts)
-
-                cls = self.class_map.get(cls_name)
-                if not cls:
-                    continue
-
-                if class_in_manim_animations(cls):
-                    lines.append(f"        self.play({cls_name}({param_str}))")
-                else:
-                    var_name = re.sub(r"[^0-9a-zA-Z_]+", "_", name.split(" (")[0]).lower()
-                    lines.append(f"        {var_name} = {cls_name}({param_str})")
-
-            code = "\n".join(lines)
+        self.sound_track.load(self.sound_path)
+        header, footer, accepts_elements = scene_frame(self.sound_path, self.ai_generated_code)
+        elements = self.scene.code_elements(self.catalog) if accepts_elements else []
 
+        edits = self.code_model.update(header, footer, elements)
+        if edits == []:
+            return
         self.code.blockSignals(True)
-        self.code.setPlainText(code)
+        if edits is None:
+            self.code.setPlainText(self.code_model.text)
+        else:
+            self._patch_code_lines(edits)
         self.code.blockSignals(False)
-        Path("script.py").write_text(code, encoding="utf-8")
-        
+        self.script_writer.schedule(self.code_model.text)
+        self._cancel_stale_ladder()
+        self.preview_timer.start()
+        self.validate_timer.start()
+
+    def refresh_preview(self):
+        if self.preview_dock.isVisible():
+            self.preview.refresh(self.code.toPlainText(), self.res_w.value(), self.res_h.value())
+
+    def _patch_code_lines(self, edits):
+        doc = self.code.document()
+        cursor = QTextCursor(doc)
+        cursor.beginEditBlock()
+        for line_no, text in edits:
+            block = doc.findBlockByNumber(line_no)
+            cursor.setPosition(block.position())
+            cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+            cursor.insertText(text)
+        cursor.endEditBlock()
+
     def sync_current_props(self):
-        item = self.elements.currentItem()
-        if item:
-            self.props_data[item.text(0)] = self.props.values()
-        
+        element = self.current_element()
+        if element:
+            self.scene_model.set_props(element.uid, self.props.values())
+
+    def _load_code(self, code_text):
+        if self._scene_locked():
+            return
+        before = self._frame()
+        self.ai_generated_code = code_text  # store full code for retention
+        self.code.setPlainText(code_text)
+        self.rebuild_elements_tree_from_code(code_text, (before, self._frame()))
+        self.update_code()  # merge current props and sound
+
+    def _load_script(self, code_text):
+        if self._scene_locked():
+            return
+        # a hand-edited script is taken verbatim; parsing it into elements would emit every line twice
+        before = self._frame()
+        changes = {e.uid: (self._record(e, row), None) for row, e in enumerate(self.scene)}
+        self.ai_generated_code = code_text
+        self.code.setPlainText(code_text)
+        self.scene_model.reset([])
+        self.props.clear_props()
+        self._commit("Load script", changes, (before, self._frame()))
+        self.update_code()
+
+    def append_ai_output(self, text):
+        cursor = self.ai_output.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.ai_output.setTextCursor(cursor)
+
     def generate_with_ai(self):
+        if self.ai_thread is not None and self.ai_thread.isRunning():
+            self.ai_thread.cancel()
+            self.ai_btn.setEnabled(False)
+            return
         prompt = self.ai_input.text().strip()
         if not prompt:
             return
-        if not client:
-            self.logs.appendPlainText("No Gemini API key provided")
+        if self.ai_backend is None:
+            try:
+                self.ai_backend = default_backend()
+            except Exception as e:
+                self.log(f"AI backend unavailable: {e}", "ai", "ERROR")
+                return
+        if self.ai_backend is None:
+            self.log("No Gemini API key provided")
             return
 
-        self.ai_btn.setEnabled(False)
-        self.logs.appendPlainText(f"Starting AI generation for: {prompt}")
+        self.ai_btn.setText("Cancel")
+        self.ai_output.clear()
+        self.log(f"Starting AI generation for: {prompt}")
 
-        def on_finished(code_text):
+        def reset_button():
+            self.ai_btn.setText("Generate")
             self.ai_btn.setEnabled(True)
+
+        def on_finished(code_text):
+            reset_button()
             if code_text:
-                self.ai_generated_code = code_text  # store full AI code for retention
                 self.ai_output.setPlainText(code_text)
-                self.code.setPlainText(code_text)
-                self.rebuild_elements_tree_from_code(code_text)
-                self.update_code()  # merge current props and sound
+                self._load_code(code_text)
             else:
-                self.logs.appendPlainText("AI generation returned empty code")
+                self.log("AI generation returned empty code")
 
-        self.ai_thread = AIThread(prompt)
+        self.ai_thread = AIThread(prompt, self.ai_backend, self.ai_cache)
+        self.ai_thread.chunk.connect(self.append_ai_output)
         self.ai_thread.finished.connect(on_finished)
-        self.ai_thread.log.connect(lambda ln: self.logs.appendPlainText(ln))
+        self.ai_thread.cancelled.connect(reset_button)
+        self.ai_thread.log.connect(lambda ln: self.log(ln, "ai"))
         self.ai_thread.start()
         
 if __name__ == "__main__":
@@ -795,5 +1039,13 @@ if __name__ == "__main__":
     app.setFont(QFont(family, 10))
     w = EditorWindow()
     w.show()
+    app.aboutToQuit.connect(w.script_writer.flush)
+    app.aboutToQuit.connect(w.scheduler.shutdown)
+    app.aboutToQuit.connect(w.validator.shutdown)
+    app.aboutToQuit.connect(w.preview.shutdown)
+    app.aboutToQuit.connect(w.playback.shutdown)
+    app.aboutToQuit.connect(w.sound_track.shutdown)
+    app.aboutToQuit.connect(w.thumbnails.shutdown)
+    app.aboutToQuit.connect(w.project.close)
     sys.exit(app.exec())
     
\ No newline at end of file
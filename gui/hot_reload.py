@@ -0,0 +1,88 @@
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from core.hot_reload import first_changed, play_keys
+
+class HotReloader(QObject):
+    changed = Signal(str, str)
+
+    def __init__(self, log, parent=None, interval=200):
+        super().__init__(parent)
+        self.log = log
+        self.paths = set()
+        self.enabled = False
+        # _keys describe the last render that finished; _rendering the one in flight
+        self._keys = None
+        self._rendering = None
+        self._seen = {}
+        self._pending = set()
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_file_changed)
+        # editors save in bursts (truncate, write, rename); wait for the file to settle
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self._flush)
+
+    def watch(self, path):
+        path = str(Path(path).resolve())
+        self.paths.add(path)
+        self._seen[path] = self._read(path)
+        if self.enabled:
+            self._arm(path)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            for path in self.paths:
+                self._arm(path)
+        else:
+            watched = self.watcher.files()
+            if watched:
+                self.watcher.removePaths(watched)
+            self._pending.clear()
+            self.timer.stop()
+
+    def _arm(self, path):
+        if Path(path).exists() and path not in self.watcher.files():
+            self.watcher.addPath(path)
+
+    def _read(self, path):
+        try:
+            return Path(path).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _on_file_changed(self, path):
+        self._pending.add(path)
+        self.timer.start()
+
+    def _flush(self):
+        pending, self._pending = self._pending, set()
+        for path in pending:
+            # atomic saves replace the file, which drops it from the watcher
+            self._arm(path)
+            text = self._read(path)
+            if text is None or text == self._seen.get(path):
+                continue
+            self._seen[path] = text
+            self.changed.emit(path, text)
+
+    def diff(self, source):
+        keys = play_keys(source)
+        first = first_changed(self._keys, keys)
+        if first is None:
+            self.log("hot-reload", "No animation changed, keeping the last render", "INFO")
+            return None
+        self._rendering = keys
+        if keys is None:
+            self.log("hot-reload", "construct() is not a straight list of animations, re-rendering all of it", "INFO")
+        return first
+
+    def rendered(self):
+        # a failed or rejected render leaves the old keys, so the next save re-renders its animations too
+        self._keys = self._rendering
+
+    def reset(self):
+        self._keys = self._rendering = None
@@ -0,0 +1,56 @@
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QComboBox, QHBoxLayout, QPlainTextEdit, QVBoxLayout, QWidget
+
+from core.logs import LEVELS
+
+class LogView(QWidget):
+    def __init__(self, buffer, interval=100, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        bar = QHBoxLayout()
+        self.level = QComboBox()
+        self.level.addItems(list(LEVELS))
+        self.level.setCurrentText("INFO")
+        self.level.currentTextChanged.connect(self.rebuild)
+        self.source = QComboBox()
+        self.source.addItem("All sources")
+        self.source.currentTextChanged.connect(self.rebuild)
+        bar.addWidget(self.level)
+        bar.addWidget(self.source)
+        bar.addStretch(1)
+        lay.addLayout(bar)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(buffer.capacity)
+        lay.addWidget(self.text, 1)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start()
+
+    def _filters(self):
+        source = self.source.currentText()
+        return self.level.currentText(), None if source == "All sources" else source
+
+    def _sync_sources(self):
+        known = {self.source.itemText(i) for i in range(self.source.count())}
+        for source in sorted(self.buffer.sources - known):
+            self.source.addItem(source)
+
+    def flush(self):
+        batch = self.buffer.drain()
+        if not batch:
+            return
+        self._sync_sources()
+        level, source = self._filters()
+        lines = [r.format() for r in self.buffer.filtered(level, source, batch)]
+        if lines:
+            self.text.appendPlainText("\n".join(lines))
+
+    def rebuild(self):
+        level, source = self._filters()
+        self.text.setPlainText("\n".join(r.format() for r in self.buffer.filtered(level, source)))
+        self.text.moveCursor(QTextCursor.End)
@@ -0,0 +1,164 @@
+from PySide6.QtCore import Qt, QAbstractItemModel, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QColor, QIcon, QPixmap
+
+class ElementsListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._rows = {}
+        self._icons = {}
+        self.catalog = None
+        self.thumbnails = None
+
+    def set_thumbnails(self, thumbnails, catalog):
+        self.thumbnails = thumbnails
+        self.catalog = catalog
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._names[index.row()]
+        if role == Qt.DecorationRole and self.thumbnails is not None:
+            return self._icon(self._names[index.row()])
+        return None
+
+    def _icon(self, name):
+        if name in self._icons:
+            return self._icons[name]
+        if not self.catalog.is_mobject(name):
+            self._icons[name] = None
+            return None
+        path = self.thumbnails.cached(name)
+        if path is None:
+            # views only ask for visible rows, so this is what makes generation lazy
+            self.thumbnails.request(self.catalog.entry(name))
+            return None
+        icon = self._icons[name] = QIcon(QPixmap(str(path)))
+        return icon
+
+    def thumbnails_ready(self, results):
+        for name, path in results:
+            self._icons[name] = QIcon(QPixmap(str(path))) if path else None
+            row = self._rows.get(name)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def name_at(self, row):
+        return self._names[row]
+
+    def add_names(self, names):
+        if not names:
+            return
+        start = len(self._names)
+        self.beginInsertRows(QModelIndex(), start, start + len(names) - 1)
+        self._names.extend(names)
+        self._rows.update((name, start + i) for i, name in enumerate(names))
+        self.endInsertRows()
+
+class RankedFilterProxy(QSortFilterProxyModel):
+    def __init__(self, search_index, parent=None):
+        super().__init__(parent)
+        self.search_index = search_index
+        self._ranks = None
+
+    def set_query(self, text):
+        self._ranks = self.search_index.rank(text)
+        self.invalidate()
+
+    def filterAcceptsRow(self, row, parent):
+        if self._ranks is None:
+            return True
+        return self.sourceModel().name_at(row) in self._ranks
+
+    def lessThan(self, left, right):
+        model = self.sourceModel()
+        a, b = model.name_at(left.row()), model.name_at(right.row())
+        if self._ranks is None:
+            return a.lower() < b.lower()
+        return self._ranks[a] < self._ranks[b]
+
+class SceneItemModel(QAbstractItemModel):
+    def __init__(self, scene, parent=None):
+        super().__init__(parent)
+        self.scene = scene
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if parent.isValid() or column != 0 or not 0 <= row < len(self.scene):
+            return QModelIndex()
+        return self.createIndex(row, 0)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.scene)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        element = self.scene[index.row()]
+        if role == Qt.DisplayRole:
+            return element.name
+        if role == Qt.ToolTipRole:
+            return element.problem
+        if role == Qt.ForegroundRole and element.problem:
+            return QColor("#E05252")
+        if role == Qt.UserRole:
+            return element.uid
+        return None
+
+    def element_at(self, index):
+        return self.scene[index.row()] if index.isValid() else None
+
+    def index_of(self, uid):
+        row = self.scene.row(uid)
+        return self.index(row) if row is not None else QModelIndex()
+
+    def insert(self, element, row=None):
+        row = len(self.scene) if row is None else min(row, len(self.scene))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.scene.insert(element, row)
+        self.endInsertRows()
+        return element
+
+    def extend(self, elements):
+        if not elements:
+            return
+        start = len(self.scene)
+        self.beginInsertRows(QModelIndex(), start, start + len(elements) - 1)
+        self.scene.extend(elements)
+        self.endInsertRows()
+
+    def remove(self, uid):
+        row = self.scene.row(uid)
+        if row is None:
+            return None
+        self.beginRemoveRows(QModelIndex(), row, row)
+        element = self.scene.remove(uid)
+        self.endRemoveRows()
+        return element
+
+    def reset(self, elements=()):
+        self.beginResetModel()
+        self.scene.reset(elements)
+        self.endResetModel()
+
+    def set_props(self, uid, props):
+        return self.scene.set_props(uid, props)
+
+    def set_problems(self, problems):
+        # problems: uid -> message; only rows whose marker actually changes are repainted
+        for row, element in enumerate(self.scene):
+            problem = problems.get(element.uid)
+            if element.problem != problem:
+                element.problem = problem
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ToolTipRole, Qt.ForegroundRole])
@@ -0,0 +1,71 @@
+from PySide6.QtCore import QUrl
+from PySide6.QtMultimedia import QAudioOutput, QMediaPlayer
+from PySide6.QtMultimediaWidgets import QVideoWidget
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+
+class PlaybackPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rank = -1
+        self._resume = None
+        self.player = QMediaPlayer(self)
+        self.audio = QAudioOutput(self)
+        self.player.setAudioOutput(self.audio)
+        self.player.setLoops(QMediaPlayer.Infinite)
+        self.player.mediaStatusChanged.connect(self._on_status)
+        self.player.playbackStateChanged.connect(self._on_state)
+
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        self.video = QVideoWidget()
+        self.player.setVideoOutput(self.video)
+        lay.addWidget(self.video, 1)
+        bar = QHBoxLayout()
+        self.btn_play = QPushButton("Play")
+        self.btn_play.clicked.connect(self.toggle)
+        self.status = QLabel("No preview rendered yet")
+        bar.addWidget(self.btn_play)
+        bar.addWidget(self.status, 1)
+        lay.addLayout(bar)
+
+    def start_ladder(self):
+        self.rank = -1
+        self._resume = None
+        # release the previous files so the next renders can overwrite them
+        self.player.stop()
+        self.player.setSource(QUrl())
+        self.status.setText("Rendering draft...")
+
+    def offer(self, rank, label, path):
+        # a slower rung can finish after a better one was preempted and requeued; never step down
+        if rank <= self.rank:
+            return False
+        first = self.rank < 0
+        self.rank = rank
+        playing = self.player.playbackState() == QMediaPlayer.PlayingState
+        self._resume = (self.player.position(), playing or first)
+        self.player.setSource(QUrl.fromLocalFile(path))
+        self.status.setText(label)
+        return True
+
+    def _on_status(self, status):
+        if status != QMediaPlayer.LoadedMedia or self._resume is None:
+            return
+        position, play = self._resume
+        self._resume = None
+        # the better version picks up where the previous one was
+        self.player.setPosition(min(position, max(0, self.player.duration() - 1)))
+        if play:
+            self.player.play()
+
+    def _on_state(self, state):
+        self.btn_play.setText("Pause" if state == QMediaPlayer.PlayingState else "Play")
+
+    def toggle(self):
+        if self.player.playbackState() == QMediaPlayer.PlayingState:
+            self.player.pause()
+        else:
+            self.player.play()
+
+    def shutdown(self):
+        self.player.stop()
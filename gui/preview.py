@@ -0,0 +1,201 @@
+from pathlib import Path
+
+from PySide6.QtCore import QRectF, Qt, QThread, Signal
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QSlider, QVBoxLayout, QWidget
+
+from core.frames import PREVIEW_FPS, FrameCache, frames_key, preview_size
+from gui.waveform import WaveformView
+
+class FrameThread(QThread):
+    frames = Signal(str, int, list)
+    timeline = Signal(str, list)
+    failed = Signal(str)
+
+    def __init__(self, daemon, key, job):
+        super().__init__()
+        self.daemon = daemon
+        self.key = key
+        self.job = job
+
+    def run(self):
+        for event in self.daemon.submit(self.job):
+            kind = event["event"]
+            if kind == "frames":
+                self.frames.emit(self.key, event["play"], event["frames"])
+            elif kind == "done":
+                self.timeline.emit(self.key, event["timeline"])
+            elif kind == "error":
+                self.failed.emit(event["text"])
+
+class FrameView(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._data = None
+        self._image = None
+        self.setMinimumSize(240, 135)
+
+    def set_frame(self, data, width, height):
+        # QImage wraps the received bytes directly; holding _data keeps that buffer alive
+        self._data = data
+        self._image = QImage(data, width, height, width * 4, QImage.Format_RGBA8888)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#000000"))
+        if self._image is None:
+            return
+        w, h = self._image.width(), self._image.height()
+        scale = min(self.width() / w, self.height() / h)
+        target = QRectF((self.width() - w * scale) / 2, (self.height() - h * scale) / 2, w * scale, h * scale)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawImage(target, self._image)
+
+class PreviewPanel(QWidget):
+    def __init__(self, daemon, workdir, log, parent=None):
+        super().__init__(parent)
+        self.daemon = daemon
+        self.workdir = Path(workdir)
+        self.log = log
+        self.cache = FrameCache()
+        self.source = ""
+        self.key = None
+        self.size = (0, 0)
+        self.timeline = []
+        self._timeline_key = None
+        self._seek = None
+        self._thread = None
+        self._pending = None
+        self._failed = None
+
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        self.view = FrameView()
+        lay.addWidget(self.view, 1)
+        bar = QHBoxLayout()
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, 0)
+        self.slider.setTickPosition(QSlider.TicksBelow)
+        self.slider.valueChanged.connect(self.show_position)
+        self.status = QLabel("No preview yet")
+        self.status.setMinimumWidth(160)
+        bar.addWidget(self.slider, 1)
+        bar.addWidget(self.status)
+        lay.addLayout(bar)
+        self.waveform = WaveformView()
+        lay.addWidget(self.waveform)
+
+    def refresh(self, source, width, height):
+        size = preview_size(width, height)
+        key = frames_key(source, *size)
+        if key == self.key:
+            return
+        self.source, self.size, self.key = source, size, key
+        self.show_position(self.slider.value())
+
+    def seek_play(self, play):
+        # applied once the timeline for the current script is known
+        self._seek = play
+        self._apply_seek()
+
+    def _apply_seek(self):
+        if self._seek is None or self._timeline_key != self.key:
+            return
+        position = 0
+        for entry in self.timeline:
+            if entry["play"] >= self._seek:
+                break
+            position += max(1, round(entry["duration"] * PREVIEW_FPS))
+        self._seek = None
+        self.slider.setValue(min(position, self.slider.maximum()))
+
+    def locate(self, position):
+        for entry in self.timeline:
+            count = max(1, round(entry["duration"] * PREVIEW_FPS))
+            if position < count:
+                return entry, position
+            position -= count
+        return (self.timeline[-1], position) if self.timeline else (None, 0)
+
+    def show_position(self, position):
+        if self.key is None:
+            return
+        entry, offset = self.locate(position)
+        play = entry["play"] if entry else 0
+        frames = self.cache.get(self.key, play)
+        if frames is None and play == 0:
+            # the first request for a new script renders the opening animation
+            play = 1
+        frames = frames or self.cache.get(self.key, play)
+        if frames is None:
+            if self._failed != self.key:
+                self._request(play)
+            return
+        self.view.set_frame(frames[min(offset, len(frames) - 1)], *self.size)
+        if entry:
+            seconds = position / PREVIEW_FPS
+            line = f" · line {entry['line']}" if entry.get("line") else ""
+            self.status.setText(f"Play {play}/{len(self.timeline)}{line} · {seconds:.2f}s")
+        else:
+            self.status.setText("Last frame")
+
+    def _request(self, play):
+        request = (self.key, play)
+        if self._thread is not None:
+            self._pending = request
+            return
+        job = {
+            "kind": "frames",
+            "source": self.source,
+            "module": "preview_scene",
+            "workdir": str(self.workdir),
+            "width": self.size[0],
+            "height": self.size[1],
+            "fps": PREVIEW_FPS,
+            "play": play,
+        }
+        thread = FrameThread(self.daemon, self.key, job)
+        thread.frames.connect(self._on_frames)
+        thread.timeline.connect(self._on_timeline)
+        thread.failed.connect(lambda text, k=self.key: self._on_failed(k, text))
+        thread.finished.connect(lambda r=request: self._on_finished(r))
+        self._thread = thread
+        self.status.setText(f"Rendering play {play}...")
+        thread.start()
+
+    def _on_frames(self, key, play, frames):
+        self.cache.put(key, play, frames)
+
+    def _on_failed(self, key, text):
+        self._failed = key
+        self.status.setText("Preview failed, see Logs")
+        self.log("preview", text, "ERROR")
+
+    def _on_timeline(self, key, timeline):
+        if key != self.key:
+            return
+        self.timeline = timeline
+        self._timeline_key = key
+        total = sum(max(1, round(e["duration"] * PREVIEW_FPS)) for e in timeline)
+        self.waveform.set_span(0.0, total / PREVIEW_FPS)
+        self.slider.blockSignals(True)
+        self.slider.setRange(0, max(0, total - 1))
+        self.slider.setTickInterval(max(1, PREVIEW_FPS))
+        self.slider.blockSignals(False)
+        self._apply_seek()
+
+    def _on_finished(self, request):
+        self._thread = None
+        pending, self._pending = self._pending, None
+        if pending and pending != request and pending[0] == self.key:
+            self._request(pending[1])
+        elif request[0] == self.key:
+            self.show_position(self.slider.value())
+
+    def shutdown(self):
+        self._pending = None
+        if self._thread is not None:
+            self.daemon.cancel()
+            self._thread.wait(3000)
+        self.daemon.stop()
@@ -0,0 +1,94 @@
+import json
+import time
+from pathlib import Path
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QFileDialog, QHBoxLayout, QHeaderView, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem,
+    QVBoxLayout, QWidget
+)
+
+from core.telemetry import to_chrome_trace
+
+COLUMNS = ["Step", "Line", "Code", "Frames", "ms", "Δ prev ms", "Cached"]
+
+class ProfilerPanel(QWidget):
+    line_activated = Signal(int)
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.spans = []
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        bar = QHBoxLayout()
+        self.summary = QLabel("No renders profiled yet")
+        self.btn_export = QPushButton("Export Trace")
+        self.btn_export.clicked.connect(self.export_trace)
+        bar.addWidget(self.summary, 1)
+        bar.addWidget(self.btn_export)
+        lay.addLayout(bar)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(COLUMNS)
+        self.tree.setRootIsDecorated(False)
+        self.tree.header().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.tree.itemDoubleClicked.connect(self._activate)
+        lay.addWidget(self.tree, 1)
+
+    def show_run(self, kind, source, spans):
+        lines = source.splitlines()
+        for span in spans:
+            line = span["args"].get("line")
+            if line and 0 < line <= len(lines):
+                span["args"]["code"] = lines[line - 1].strip()
+        previous = self.history.previous(kind)
+        before = {}
+        for span in previous["spans"] if previous else []:
+            code = span["args"].get("code")
+            if span["name"] == "play" and code:
+                before.setdefault(code, span["duration"])
+            elif span["name"] != "play":
+                before.setdefault(span["name"], span["duration"])
+
+        self.tree.clear()
+        plays = [s for s in spans if s["name"] == "play"]
+        slowest = max((s["duration"] for s in plays if not s["args"].get("cached")), default=0)
+        for span in spans:
+            args = span["args"]
+            if span["name"] == "play":
+                step = f"play {args.get('play')}"
+            elif span["name"] == "segment":
+                step = f"segment {args.get('play')}+{args.get('plays', 1) - 1}"
+            else:
+                step = span["name"]
+            ms = span["duration"] * 1000
+            ref = before.get(args.get("code") if span["name"] == "play" else span["name"])
+            delta = f"{ms - ref * 1000:+.0f}" if ref is not None else ""
+            item = QTreeWidgetItem([
+                step, str(args.get("line") or ""), args.get("code", ""), str(args.get("frames", "")),
+                f"{ms:.0f}", delta, "yes" if args.get("cached") else "",
+            ])
+            item.setData(0, Qt.UserRole, args.get("line"))
+            if span["name"] == "play" and slowest and span["duration"] == slowest:
+                for col in range(len(COLUMNS)):
+                    item.setBackground(col, QColor("#FFE2E2"))
+            self.tree.addTopLevelItem(item)
+
+        total = max(s["start"] + s["duration"] for s in spans) - min(s["start"] for s in spans) if spans else 0
+        hits = sum(1 for s in plays if s["args"].get("cached"))
+        self.summary.setText(f"{kind.title()}: {len(plays) or '-'} animations, {hits} cached, {total:.2f}s")
+        self.spans = spans
+        self.history.append({"time": time.time(), "kind": kind, "spans": spans})
+
+    def _activate(self, item):
+        line = item.data(0, Qt.UserRole)
+        if line:
+            self.line_activated.emit(int(line))
+
+    def export_trace(self):
+        if not self.spans:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "render_trace.json", "JSON Files (*.json)")
+        if path:
+            Path(path).write_text(json.dumps(to_chrome_trace(self.spans), indent=1), encoding="utf-8")
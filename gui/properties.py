@@ -0,0 +1,288 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, Signal
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QApplication, QStyledItemDelegate, QTableView, QHeaderView, QWidget, QHBoxLayout,
+    QLineEdit, QSlider, QColorDialog
+)
+
+from core.schema import HEX_COLOR, MISSING
+
+ROW_HEIGHT = 30
+
+class PropertiesModel(QAbstractTableModel):
+    edited = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # rows: [param, text, value, error]; text is what the user sees, value is its typed form
+        self._rows = []
+        self._extras = {}
+        self._explicit = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ("Property", "Value")[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return flags | Qt.ItemIsEditable if index.column() == 1 else flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        param, text, _, error = self._rows[index.row()]
+        if index.column() == 0:
+            return param.name if role in (Qt.DisplayRole, Qt.ToolTipRole) else None
+        if role == Qt.EditRole:
+            return text
+        if role == Qt.DisplayRole:
+            return text if text or param.kind != "color" else "Pick color"
+        if role == Qt.ToolTipRole:
+            return error
+        if role == Qt.ForegroundRole and error:
+            return QColor("#d9534f")
+        if role == Qt.BackgroundRole and param.kind == "color":
+            return QColor(text if HEX_COLOR.match(text) else "#FFFFFF")
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != 1 or role != Qt.EditRole:
+            return False
+        row = self._rows[index.row()]
+        if row[1] == value:
+            return False
+        typed, error = row[0].parse(value)
+        row[1], row[3] = value, error
+        if error is None:
+            # a bad edit keeps the last good value, so the generated code never breaks
+            row[2] = typed
+        self.dataChanged.emit(index, index)
+        self.edited.emit()
+        return True
+
+    def param(self, row):
+        return self._rows[row][0]
+
+    def editor_kind(self, row):
+        param = self._rows[row][0]
+        if param.kind == "color":
+            return "color"
+        return "number" if param.slider else "text"
+
+    def value(self, row):
+        return self._rows[row][1]
+
+    def load(self, schema, params=None):
+        params = params or {}
+        rows = []
+        for param in schema or ():
+            value = params.get(param.name, param.default)
+            rows.append([param, param.display(value), value, None])
+        self.beginResetModel()
+        self._rows = rows
+        self._extras = {k: v for k, v in params.items() if schema is None or schema.get(k) is None}
+        self._explicit = set(params)
+        self.endResetModel()
+
+    def values(self):
+        out = dict(self._extras)
+        for param, text, value, _ in self._rows:
+            if value is MISSING:
+                continue
+            # inherited kwargs are only emitted once they differ from the schema default,
+            # or when the element already carries them
+            if param.optional and text == param.default_text and param.name not in self._explicit:
+                continue
+            out[param.name] = value
+        return out
+
+class NumberEditor(QWidget):
+    edited = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        lay = QHBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        lay.setSpacing(4)
+        self.step = 0.01
+        self.slider = QSlider(Qt.Horizontal)
+        self.entry = QLineEdit()
+        self.entry.setMaximumWidth(80)
+        self.slider.valueChanged.connect(self._slid)
+        self.entry.editingFinished.connect(self._typed)
+        lay.addWidget(self.slider)
+        lay.addWidget(self.entry)
+        self.setFocusProxy(self.entry)
+
+    def text(self):
+        return self.entry.text()
+
+    def set_range(self, low, high, step):
+        self.step = step
+        self.slider.blockSignals(True)
+        self.slider.setRange(round(low / step), round(high / step))
+        self.slider.blockSignals(False)
+
+    def setText(self, text):
+        self.entry.setText(text)
+        self._sync_slider()
+
+    def _sync_slider(self):
+        try:
+            value = round(float(self.entry.text()) / self.step)
+        except ValueError:
+            return
+        self.slider.blockSignals(True)
+        self.slider.setValue(value)
+        self.slider.blockSignals(False)
+
+    def _slid(self, v):
+        self.entry.setText(str(v) if self.step == 1 else str(round(v * self.step, 4)))
+        self.edited.emit()
+
+    def _typed(self):
+        self._sync_slider()
+        self.edited.emit()
+
+class PropertyDelegate(QStyledItemDelegate):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # editors outlive the rows they were opened on; closing one parks it here for the next row
+        self._pool = {"text": [], "number": []}
+
+    def _make(self, kind, parent):
+        if kind == "number":
+            editor = NumberEditor(parent)
+            editor.edited.connect(lambda e=editor: self.commitData.emit(e))
+        else:
+            editor = QLineEdit(parent)
+            editor.setMinimumHeight(28)
+            editor.editingFinished.connect(lambda e=editor: self.commitData.emit(e))
+        editor.setProperty("kind", kind)
+        return editor
+
+    def createEditor(self, parent, option, index):
+        kind = index.model().editor_kind(index.row())
+        if kind == "color":
+            return None
+        pool = self._pool[kind]
+        editor = pool.pop() if pool else self._make(kind, parent)
+        editor.setParent(parent)
+        editor.show()
+        return editor
+
+    def destroyEditor(self, editor, index):
+        editor.hide()
+        self._pool[editor.property("kind")].append(editor)
+
+    def setEditorData(self, editor, index):
+        editor.blockSignals(True)
+        if isinstance(editor, NumberEditor):
+            editor.set_range(*index.model().param(index.row()).slider)
+        editor.setText(index.data(Qt.EditRole))
+        editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text())
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and index.column() == 1
+                and model.editor_kind(index.row()) == "color"):
+            current = model.value(index.row())
+            col = QColorDialog.getColor(QColor(current if HEX_COLOR.match(current) else "#FFFFFF"))
+            if col.isValid():
+                model.setData(index, col.name())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+class PropertiesTable(QTableView):
+    valueChanged = Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.prop_model = PropertiesModel(self)
+        self.delegate = PropertyDelegate(self)
+        self.setModel(self.prop_model)
+        # view-wide so editors released on a model reset still go back to this pool
+        self.setItemDelegate(self.delegate)
+        self.setEditTriggers(QTableView.NoEditTriggers)
+        self.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.setAlternatingRowColors(True)
+        self._open = {}
+        self.prop_model.edited.connect(self.emit_values)
+        self.verticalScrollBar().valueChanged.connect(self._sync_editors)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._sync_editors()
+
+    def _sync_editors(self, *args):
+        # only rows in the viewport get a live editor; the rest are painted from the model
+        count = self.prop_model.rowCount()
+        first = self.rowAt(0)
+        last = self.rowAt(self.viewport().height() - 1)
+        visible = range(first, (count - 1 if last < 0 else last) + 1) if first >= 0 else range(0)
+        for row in [r for r in self._open if r not in visible]:
+            self.closePersistentEditor(self.prop_model.index(row, 1))
+            del self._open[row]
+        for row in visible:
+            if row not in self._open and self.prop_model.editor_kind(row) != "color":
+                index = self.prop_model.index(row, 1)
+                self.openPersistentEditor(index)
+                self._open[row] = self.indexWidget(index)
+
+    def clear_props(self):
+        self.show_properties(None)
+
+    def show_properties(self, schema, params=None):
+        # the reset hands every open editor back to the delegate's pool
+        self._open.clear()
+        self.prop_model.load(schema, params)
+        self._sync_editors()
+
+    def _focused_row(self):
+        w = QApplication.focusWidget()
+        if not isinstance(w, QLineEdit):
+            return None
+        for row, editor in self._open.items():
+            if editor is w or editor.isAncestorOf(w):
+                return row
+        return None
+
+    def _surround(self, mark):
+        row = self._focused_row()
+        if row is None:
+            return
+        editor = self._open[row]
+        # pick up anything typed but not yet committed
+        txt = editor.text()
+        if not (txt.startswith(mark) and txt.endswith(mark)):
+            txt = f"{mark}{txt}{mark}"
+        index = self.prop_model.index(row, 1)
+        self.prop_model.setData(index, txt)
+        self.delegate.setEditorData(editor, index)
+
+    def surround_with_dollars(self):
+        self._surround("$")
+
+    def surround_with_exclaim(self):
+        self._surround("!")
+
+    def values(self):
+        return self.prop_model.values()
+
+    def emit_values(self):
+        self.valueChanged.emit(self.values())
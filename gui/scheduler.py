@@ -0,0 +1,172 @@
+import itertools
+import shutil
+from collections import deque
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+PRIORITIES = {"draft": 0, "preview": 0, "render": 10, "upgrade": 30}
+# background work that gives up the CPU whenever something more urgent is queued. It runs on its
+# own worker, so pausing it never costs the warm one its loaded manim
+PREEMPTIBLE = {"upgrade"}
+
+class RenderJob:
+    def __init__(self, job_id, kind, payload, label=None, group=None):
+        self.id = job_id
+        self.kind = kind
+        self.priority = PRIORITIES.get(kind, 20)
+        self.payload = payload
+        self.label = label or kind.title()
+        self.group = group
+        self.status = "queued"
+        self.output = None
+
+    def describe(self):
+        return f"#{self.id} {self.label} — {self.status}"
+
+class RenderThread(QThread):
+    output = Signal(str)
+    telemetry = Signal(list)
+
+    def __init__(self, daemon, job, log):
+        super().__init__()
+        self.daemon = daemon
+        self.job = job
+        self.log = log
+
+    def run(self):
+        # log lines go straight into the thread-safe LogBuffer instead of one Qt signal each
+        spans = []
+        for event in self.daemon.submit(self.job):
+            kind = event["event"]
+            if kind == "span":
+                spans.append(event)
+            elif kind == "log":
+                self.log("render", event["text"], event.get("level"))
+            elif kind == "error":
+                self.log("render", event["text"], "ERROR")
+            elif kind == "progress":
+                state = "reused from segment cache" if event.get("cached") else "rendered"
+                self.log("render", f"Animation {event['play']} {state}", "DEBUG")
+            elif kind == "cache":
+                self.log("render", f"Segment cache: {event['hits']}/{event['total']} animations reused", "INFO")
+            elif kind == "done" and event.get("output"):
+                self.output.emit(event["output"])
+        if spans:
+            self.telemetry.emit(spans)
+
+class RenderScheduler(QObject):
+    output = Signal(str, str)
+    changed = Signal()
+    profiled = Signal(str, str, list)
+
+    def __init__(self, daemon, jobs_dir, log, background=None, parent=None):
+        super().__init__(parent)
+        self.daemon = daemon
+        self.background = background or daemon
+        self.log = log
+        self.jobs_dir = Path(jobs_dir)
+        self.queue = []
+        self.running = None
+        self.history = deque(maxlen=8)
+        self._thread = None
+        self._ids = itertools.count(1)
+
+    def jobs(self):
+        current = [self.running] if self.running else []
+        return current + self.queue + list(reversed(self.history))
+
+    def submit(self, kind, payload, label=None, group=None):
+        job = RenderJob(next(self._ids), kind, payload, label, group)
+        if group is None:
+            # a newer request makes older previews stale; a queued render is simply replaced
+            for queued in [j for j in self.queue if j.kind == kind and j.group is None]:
+                self._drop(queued, "superseded")
+            if kind == "preview" and self.running and self.running.kind == kind:
+                self.cancel(self.running)
+        running = self.running
+        if (running and running.kind in PREEMPTIBLE and running.priority > job.priority
+                and running.status == "running"):
+            # the upgrade goes back in the queue; finished animations stay in the segment cache
+            self.log("scheduler", f"Pausing {running.label.lower()} #{running.id} for {job.label.lower()}", "INFO")
+            self.cancel(running)
+            self.queue.append(RenderJob(next(self._ids), running.kind, running.payload, running.label, running.group))
+        self.queue.append(job)
+        self.queue.sort(key=lambda j: (j.priority, j.id))
+        self.changed.emit()
+        self._pump()
+        return job
+
+    def _daemon(self, job):
+        return self.background if job.kind in PREEMPTIBLE else self.daemon
+
+    def has_group(self, group):
+        return any(j.group == group for j in self.queue) or bool(self.running and self.running.group == group)
+
+    def supersede(self, group):
+        for job in [j for j in self.queue if j.group == group]:
+            self._drop(job, "superseded")
+        if self.running and self.running.group == group:
+            self.cancel(self.running)
+        self.changed.emit()
+
+    def _drop(self, job, status):
+        self.queue.remove(job)
+        job.status = status
+        self.history.append(job)
+
+    def cancel(self, job):
+        if job in self.queue:
+            self._drop(job, "cancelled")
+        elif job is self.running and job.status == "running":
+            job.status = "cancelling"
+            self._daemon(job).cancel()
+        self.changed.emit()
+
+    def cancel_all(self):
+        for job in list(self.queue):
+            self._drop(job, "cancelled")
+        if self.running:
+            self.cancel(self.running)
+        self.changed.emit()
+
+    def _pump(self):
+        if self.running or not self.queue:
+            return
+        job = self.queue.pop(0)
+        workdir = self.jobs_dir / f"job{job.id}"
+        job.status = "running"
+        self.running = job
+        thread = RenderThread(self._daemon(job), dict(job.payload, workdir=str(workdir)), self.log)
+        thread.output.connect(lambda path, j=job: self._on_output(j, path))
+        thread.telemetry.connect(lambda spans, j=job: self.profiled.emit(j.kind, j.payload["source"], spans))
+        thread.finished.connect(lambda j=job, w=workdir: self._on_finished(j, w))
+        self._thread = thread
+        thread.start()
+        self.changed.emit()
+
+    def _on_output(self, job, path):
+        job.output = path
+        if job.status == "running":
+            self.output.emit(path, job.label)
+
+    def _on_finished(self, job, workdir):
+        if job.status == "cancelling":
+            job.status = "cancelled"
+            self.log("scheduler", f"Cancelled {job.label.lower()} #{job.id}", "INFO")
+        else:
+            job.status = "done" if job.output else "failed"
+        shutil.rmtree(workdir, ignore_errors=True)
+        self.history.append(job)
+        self.running = None
+        self._thread = None
+        self.changed.emit()
+        self._pump()
+
+    def shutdown(self):
+        self.queue.clear()
+        if self._thread is not None:
+            self._daemon(self.running).cancel()
+            self._thread.wait(3000)
+        self.daemon.stop()
+        self.background.stop()
@@ -0,0 +1,89 @@
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+def source_key(source):
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+class ValidationThread(QThread):
+    done = Signal(object, object)
+    failed = Signal(str)
+
+    def __init__(self, daemon, job):
+        super().__init__()
+        self.daemon = daemon
+        self.job = job
+
+    def run(self):
+        problems = None
+        length = None
+        for event in self.daemon.submit(self.job):
+            if event["event"] == "done":
+                problems = event.get("problems", [])
+                length = event.get("length")
+            elif event["event"] == "error":
+                # the worker crashed or never started; that says nothing about the scene itself
+                self.failed.emit(event["text"])
+        self.done.emit(problems, length)
+
+class Validator(QObject):
+    # problems is None when the scene could not be checked at all
+    checked = Signal(str, object)
+    failed = Signal(str)
+
+    def __init__(self, daemon, workdir, parent=None, keep=32):
+        super().__init__(parent)
+        self.daemon = daemon
+        self.workdir = Path(workdir)
+        self.keep = keep
+        self.results = OrderedDict()
+        self.lengths = {}
+        self._thread = None
+        self._pending = None
+
+    def result(self, source):
+        return self.results.get(source_key(source))
+
+    def length(self, source):
+        return self.lengths.get(source_key(source))
+
+    def check(self, source):
+        key = source_key(source)
+        if key in self.results:
+            self.checked.emit(key, self.results[key])
+            return
+        if self._thread is not None:
+            self._pending = source
+            return
+        job = {"kind": "validate", "source": source, "module": "validate_scene", "workdir": str(self.workdir)}
+        thread = ValidationThread(self.daemon, job)
+        thread.done.connect(lambda problems, length, k=key: self._on_done(k, problems, length))
+        thread.failed.connect(self.failed)
+        thread.finished.connect(self._on_finished)
+        self._thread = thread
+        thread.start()
+
+    def _on_done(self, key, problems, length=None):
+        if problems is None:
+            self.checked.emit(key, None)
+            return
+        self.results[key] = problems
+        if length is not None:
+            self.lengths[key] = length
+        while len(self.results) > self.keep:
+            old, _ = self.results.popitem(last=False)
+            self.lengths.pop(old, None)
+        self.checked.emit(key, problems)
+
+    def _on_finished(self):
+        self._thread = None
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self.check(pending)
+
+    def shutdown(self):
+        self._pending = None
+        if self._thread is not None:
+            self._thread.wait(3000)
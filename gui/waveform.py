@@ -0,0 +1,110 @@
+from PySide6.QtCore import QThread, QPointF, Signal
+from PySide6.QtGui import QColor, QPainter, QPen
+from PySide6.QtWidgets import QWidget
+
+from core.audio import AudioCache, PeakIndex
+
+class AudioThread(QThread):
+    ready = Signal(str, object)
+    failed = Signal(str, str)
+
+    def __init__(self, path, cache):
+        super().__init__()
+        self.path = path
+        self.cache = cache
+
+    def run(self):
+        try:
+            key = self.cache.prepare(self.path)
+            self.ready.emit(self.path, PeakIndex.load(self.cache.peaks_path(key)))
+        except Exception as e:
+            self.failed.emit(self.path, str(e))
+
+class WaveformView(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.peaks = None
+        self.span = (0.0, 0.0)
+        self._cache = None
+        self.setMinimumHeight(36)
+        self.setMaximumHeight(48)
+        self.hide()
+
+    def set_peaks(self, peaks):
+        self.peaks = peaks
+        self._cache = None
+        self.setVisible(peaks is not None)
+        self.update()
+
+    def set_span(self, start, end):
+        if (start, end) != self.span:
+            self.span = (start, end)
+            self._cache = None
+            self.update()
+
+    def _columns(self):
+        # peaks for this width and span come straight from the index, no decoding involved
+        start, end = self.span
+        if end <= start:
+            start, end = 0.0, self.peaks.duration
+        key = (self.width(), start, end)
+        if self._cache is None or self._cache[0] != key:
+            self._cache = (key, self.peaks.peaks(start, end, self.width()))
+        return self._cache[1]
+
+    def paintEvent(self, event):
+        if self.peaks is None:
+            return
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 40))
+        painter.setPen(QPen(QColor("#58a6ff"), 1))
+        mid = self.height() / 2
+        half = mid - 1
+        for x, (low, high) in enumerate(self._columns()):
+            if low == high == 0:
+                continue
+            painter.drawLine(QPointF(x + 0.5, mid - high * half), QPointF(x + 0.5, mid - low * half))
+        painter.setPen(QPen(QColor(255, 255, 255, 60), 1))
+        painter.drawLine(0, int(mid), self.width(), int(mid))
+        painter.end()
+
+    def resizeEvent(self, event):
+        self._cache = None
+        super().resizeEvent(event)
+
+class SoundTrack:
+    def __init__(self, view, log):
+        self.view = view
+        self.log = log
+        self.cache = AudioCache()
+        self.path = None
+        self._thread = None
+
+    def load(self, path):
+        if path == self.path:
+            return
+        self.path = path
+        if not path:
+            self.view.set_peaks(None)
+            return
+        if self._thread is not None and self._thread.isRunning():
+            # the running job finishes into the cache; _on_ready ignores it if the path moved on
+            self._thread.finished.connect(lambda p=path: self._start(p) if p == self.path else None)
+            return
+        self._start(path)
+
+    def _start(self, path):
+        thread = AudioThread(path, self.cache)
+        thread.ready.connect(self._on_ready)
+        thread.failed.connect(lambda p, text: self.log("audio", f"Could not prepare {p}: {text}", "ERROR"))
+        self._thread = thread
+        thread.start()
+
+    def _on_ready(self, path, peaks):
+        if path == self.path:
+            self.view.set_peaks(peaks)
+            self.log("audio", f"Prepared {path} ({peaks.duration:.1f}s)", "INFO")
+
+    def shutdown(self):
+        if self._thread is not None:
+            self._thread.wait(3000)
@@ -0,0 +1,25 @@
+from core.schema import ParamSchema, param_kind
+
+def spec(type_name, default="", **extra):
+    return dict({"type": type_name, "default": default, "color": False, "inherited": False}, **extra)
+
+def test_optional_str_is_text():
+    assert param_kind("font", spec("str | None", None)) == "text"
+    assert param_kind("code_string", spec("Optional[str]", None)) == "text"
+    assert param_kind("font", spec("str", "")) == "text"
+
+def test_compound_types_are_expressions():
+    assert param_kind("t2c", spec("dict[str, str] | None", None)) == "expr"
+    assert param_kind("points", spec("Sequence[float]")) == "expr"
+
+def test_numbers_and_bools():
+    assert param_kind("radius", spec("float", 1)) == "float"
+    assert param_kind("n", spec("int | None", None)) == "int"
+    assert param_kind("flag", spec("bool", False)) == "bool"
+
+def test_text_values_are_quoted_and_expressions_are_not():
+    font = ParamSchema("font", spec("str | None", None))
+    assert font.parse("Comic Sans") == ("Comic Sans", None)
+    assert font.emit("Arial") == "'Arial'"
+    t2c = ParamSchema("t2c", spec("dict[str, str] | None", None))
+    assert t2c.emit(t2c.coerce('{"x": RED}')) == '{"x": RED}'
@@ -0,0 +1,20 @@
+from core.segments import segment_keys, uses_updaters
+
+SCENE = """from manim import *
+
+class Output(Scene):
+    def construct(self):
+        circle = Circle()
+{extra}        self.play(Create(circle))
+        self.play(FadeOut(circle))
+"""
+
+def test_straight_scene_has_a_key_per_play():
+    source = SCENE.format(extra="")
+    assert len(segment_keys(source, {})) == 2
+    assert not uses_updaters(source)
+
+def test_updaters_are_detected():
+    assert uses_updaters(SCENE.format(extra="        circle.add_updater(lambda m, dt: m.rotate(dt))\n"))
+    assert uses_updaters(SCENE.format(extra="        dot = always_redraw(lambda: Dot())\n"))
+    assert uses_updaters(SCENE.format(extra="        t = ValueTracker(0)\n"))